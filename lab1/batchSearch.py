@@ -0,0 +1,185 @@
+# batchSearch.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Solves many search problems in parallel.
+
+The job file has one JSON object per line describing a search to run:
+
+  {"id": "a", "layout": "mediumMaze", "fn": "astar", "heuristic": "manhattanHeuristic"}
+  {"layout": "bigMaze", "fn": "jps", "start": [35, 35], "goal": [1, 1]}
+  {"layout": "tinySearch", "prob": "FoodSearchProblem", "fn": "ucs"}
+
+fn, prob and heuristic take the same names as the SearchAgent options and
+default to bfs, PositionSearchProblem and nullHeuristic.  start overrides
+Pacman's position; goal is only understood by PositionSearchProblem.
+
+Jobs are fanned out over a multiprocessing pool.  Each worker parses a
+layout the first time one of its jobs needs it and keeps it, and results
+are written as JSON lines in the order the jobs complete:
+
+  python batchSearch.py -j jobs.jsonl -o results.jsonl -n 4
+"""
+
+import json
+import sys
+import time
+
+# Maps layout names to (layout, initial GameState) in each worker process
+LAYOUT_CACHE = {}
+
+def loadLayout(name):
+    "Returns the parsed layout and its initial game state, parsing it only once per process"
+    if name not in LAYOUT_CACHE:
+        import layout
+        from pacman import GameState
+        lay = layout.getLayout(name)
+        if lay == None: raise Exception("The layout " + name + " cannot be found")
+        state = GameState()
+        state.initialize(lay, lay.getNumGhosts())
+        LAYOUT_CACHE[name] = (lay, state)
+    return LAYOUT_CACHE[name]
+
+def searchFunction(fn, heuristic):
+    "Looks up a search function and heuristic by name, as SearchAgent does"
+    import search, searchAgents
+    if fn not in dir(search):
+        raise AttributeError, fn + ' is not a search function in search.py.'
+    func = getattr(search, fn)
+    if 'heuristic' not in func.func_code.co_varnames:
+        return func
+    if heuristic in dir(searchAgents):
+        heur = getattr(searchAgents, heuristic)
+    elif heuristic in dir(search):
+        heur = getattr(search, heuristic)
+    else:
+        raise AttributeError, heuristic + ' is not a function in searchAgents.py or search.py.'
+    return lambda problem: func(problem, heuristic=heur)
+
+def makeProblem(job):
+    "Builds the search problem a job describes"
+    import searchAgents
+    from game import Configuration, Directions
+    state = loadLayout(job['layout'])[1]
+    prob = job.get('prob', 'PositionSearchProblem')
+    if prob not in dir(searchAgents) or not prob.endswith('Problem'):
+        raise AttributeError, prob + ' is not a search problem type in SearchAgents.py.'
+    if 'start' in job:
+        state = state.deepCopy()
+        state.data.agentStates[0].configuration = Configuration(tuple(job['start']), Directions.STOP)
+    if prob == 'PositionSearchProblem':
+        goal = tuple(job.get('goal', (1, 1)))
+        return searchAgents.PositionSearchProblem(state, goal=goal, warn=False, visualize=False)
+    if 'goal' in job:
+        raise Exception(prob + ' does not take a goal')
+    return getattr(searchAgents, prob)(state)
+
+def initWorker():
+    "Sends whatever problems print to stderr so it cannot corrupt results on stdout"
+    sys.stdout = sys.stderr
+
+def runJob(job):
+    """
+    Runs one job and returns its result: the job's fields plus status
+    ('ok' or 'error'), actions, cost, expanded and time.
+    """
+    result = dict(job)
+    try:
+        problem = makeProblem(job)
+        function = searchFunction(job.get('fn', 'bfs'), job.get('heuristic', 'nullHeuristic'))
+        start = time.time()
+        actions = function(problem)
+        result['time'] = time.time() - start
+        result['status'] = 'ok'
+        result['actions'] = actions
+        result['cost'] = problem.getCostOfActions(actions)
+        result['expanded'] = getattr(problem, '_expanded', None)
+    except Exception, e:
+        result['status'] = 'error'
+        result['error'] = '%s: %s' % (e.__class__.__name__, e)
+    return result
+
+def readJobs(path):
+    "Reads a job file; blank lines and lines starting with # are skipped"
+    if path == '-':
+        lines = sys.stdin.readlines()
+    else:
+        f = open(path)
+        try: lines = f.readlines()
+        finally: f.close()
+    jobs = []
+    for line in lines:
+        line = line.strip()
+        if line == '' or line.startswith('#'): continue
+        jobs.append(json.loads(line))
+    return jobs
+
+def runBatch(jobs, output, processes=None, chunksize=1):
+    """
+    Runs the jobs over a pool of processes (one per CPU by default) and
+    writes each result to the file object output as soon as it completes.
+    Returns the number of jobs that failed.
+    """
+    import multiprocessing
+    pool = multiprocessing.Pool(processes, initWorker)
+    failures = 0
+    try:
+        for result in pool.imap_unordered(runJob, jobs, chunksize):
+            if result['status'] != 'ok': failures += 1
+            output.write(json.dumps(result, sort_keys=True) + '\n')
+            output.flush()
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return failures
+
+def readCommand(argv):
+    from optparse import OptionParser
+    usageStr = """
+    USAGE:      python batchSearch.py <options>
+    EXAMPLES:   (1) python batchSearch.py -j jobs.jsonl
+                    - solves every job, writing results to standard output
+                (2) python batchSearch.py -j jobs.jsonl -o results.jsonl -n 8
+                    - solves the jobs with 8 processes
+    """
+    parser = OptionParser(usageStr)
+    parser.add_option('-j', '--jobs', dest='jobs', default='-',
+                      help='The job file, one JSON object per line (- for standard input) [Default: %default]')
+    parser.add_option('-o', '--output', dest='output', default='-',
+                      help='Where to write the results (- for standard output) [Default: %default]')
+    parser.add_option('-n', '--processes', type='int', dest='processes', default=None,
+                      help='Number of worker processes (default: one per CPU)')
+    parser.add_option('--chunksize', type='int', dest='chunksize', default=1,
+                      help='Jobs handed to a worker at a time [Default: %default]')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    jobs = readJobs(options.jobs)
+    if options.output == '-':
+        output = sys.stdout
+    else:
+        output = open(options.output, 'w')
+    try:
+        failures = runBatch(jobs, output, options.processes, options.chunksize)
+    finally:
+        if output is not sys.stdout: output.close()
+    sys.stderr.write('%d jobs, %d failed\n' % (len(jobs), failures))
+    sys.exit(failures > 0 and 1 or 0)
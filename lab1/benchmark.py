@@ -0,0 +1,349 @@
+# benchmark.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Headless benchmark for the search algorithms in search.py.
+
+Every combination of search function, heuristic and bundled layout that
+makes sense together is played as a pacman game with textDisplay's
+NullGraphics, so no Tk is needed.  For each combination the search time,
+the number of expanded nodes and the peak number of nodes held in the
+frontier and closed set are recorded through search.enableMetrics.
+
+Each run is played in a child process forked for it, whose peak resident
+size, less its size when it started, is the memory of the combination.
+Caches a run fills (distance tables, pattern databases) die with its
+child, so every run starts from the same state.  Where os.fork is missing
+the runs share this process and no memory is recorded.
+
+Results can be stored as a baseline and later runs compared against it:
+
+  python benchmark.py --save                 (record benchmarkBaseline.json)
+  python benchmark.py                        (compare against it)
+  python benchmark.py -l tinyMaze,mediumMaze -f bfs,astar --threshold 0.5
+
+The exit status is 1 if any combination regressed by more than the
+threshold.  Combinations the baseline does not know yet are listed as
+having no baseline; record them with --save.
+
+Timings only mean something on the machine that recorded them, so the
+baseline is not checked in: record one before changing the code.  Search
+times are compared only when both sides kept the fastest of at least
+MIN_TIMING_REPEAT runs; the other measures are deterministic.
+"""
+
+import os
+import random
+import resource
+import sys
+
+import ghostAgents
+import layout
+import search
+import searchAgents
+import textDisplay
+import util
+from pacman import ClassicGameRules
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarkBaseline.json')
+
+ALGORITHMS = ['dfs', 'bfs', 'ucs', 'astar']
+HEURISTICS = ['nullHeuristic', 'manhattanHeuristic', 'euclideanHeuristic', 'landmarkHeuristic', 'cornersHeuristic', 'foodHeuristic']
+
+# The heuristics each problem type can be solved with
+PROBLEM_HEURISTICS = {
+    'PositionSearchProblem': ['nullHeuristic', 'manhattanHeuristic', 'euclideanHeuristic', 'landmarkHeuristic'],
+    'CornersProblem': ['nullHeuristic', 'cornersHeuristic'],
+    'FoodSearchProblem': ['nullHeuristic', 'foodHeuristic'],
+}
+
+# Food search is exponential in the number of dots, so only small layouts
+# take part in it
+MAX_FOOD_SEARCH_DOTS = 15
+
+# Time changes smaller than this (in seconds) are treated as noise
+MIN_TIME_DIFFERENCE = 0.01
+# Search times are only compared if both results are the best of this many runs
+MIN_TIMING_REPEAT = 3
+# Memory changes smaller than this (in kilobytes) are treated as noise
+MIN_MEMORY_DIFFERENCE = 1024
+
+# The measurements compared against the baseline
+MEASURES = ['searchTime', 'expanded', 'peakNodes', 'peakMemoryKB']
+
+def problemsFor(lay):
+    """
+    Returns the names of the search problems that fit a layout: regular
+    mazes (a single dot at (1,1)) for PositionSearchProblem, layouts whose
+    only dots are in the four corners for CornersProblem and layouts with
+    few dots for FoodSearchProblem.
+    """
+    food = lay.food
+    numFood = food.count()
+    top, right = lay.height - 2, lay.width - 2
+    problems = []
+    if numFood == 1 and food[1][1]:
+        problems.append('PositionSearchProblem')
+    if numFood == 4 and food[1][1] and food[1][top] and food[right][1] and food[right][top]:
+        problems.append('CornersProblem')
+    if 0 < numFood <= MAX_FOOD_SEARCH_DOTS:
+        problems.append('FoodSearchProblem')
+    return problems
+
+def combinations(layoutNames, algorithms=ALGORITHMS, heuristics=HEURISTICS):
+    """
+    Yields (layoutName, problem, algorithm, heuristic) for every combination
+    to benchmark.  Only A* takes a heuristic; the other algorithms are run
+    once per problem with nullHeuristic.
+    """
+    for layoutName in layoutNames:
+        lay = layout.getLayout(layoutName)
+        for problem in problemsFor(lay):
+            for algorithm in algorithms:
+                for heuristic in PROBLEM_HEURISTICS[problem]:
+                    if heuristic not in heuristics: continue
+                    if algorithm != 'astar' and heuristic != 'nullHeuristic': continue
+                    yield layoutName, problem, algorithm, heuristic
+
+def resultKey(layoutName, problem, algorithm, heuristic):
+    return ' '.join([layoutName, problem, algorithm, heuristic])
+
+class _NullWriter:
+    "Swallows the progress messages agents print"
+    def write(self, text): pass
+    def flush(self): pass
+
+def maxResidentKB():
+    "The peak resident size of this process so far, in kilobytes"
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin': return peak // 1024 # Reported in bytes there
+    return peak
+
+def runIsolated(layoutName, problem, algorithm, heuristic, timeout=60):
+    """
+    Runs runCombination in a child process and returns its result, with
+    the memory the child needed on top of its starting size recorded as
+    peakMemoryKB.  Without os.fork the combination runs in this process.
+    """
+    import cPickle
+    if not hasattr(os, 'fork'):
+        return runCombination(layoutName, problem, algorithm, heuristic, timeout)
+    readEnd, writeEnd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(readEnd)
+        try:
+            startKB = maxResidentKB()
+            result = runCombination(layoutName, problem, algorithm, heuristic, timeout)
+            if result['status'] == 'ok':
+                result['peakMemoryKB'] = maxResidentKB() - startKB
+            f = os.fdopen(writeEnd, 'wb')
+            cPickle.dump(result, f, cPickle.HIGHEST_PROTOCOL)
+            f.close()
+        finally:
+            os._exit(0)
+    os.close(writeEnd)
+    f = os.fdopen(readEnd, 'rb')
+    try:
+        try: return cPickle.load(f)
+        except EOFError:
+            return {'layout': layoutName, 'problem': problem, 'algorithm': algorithm, 'heuristic': heuristic,
+                    'status': 'error', 'error': 'the benchmark process died'}
+    finally:
+        f.close()
+        os.waitpid(pid, 0)
+
+def runCombination(layoutName, problem, algorithm, heuristic, timeout=60):
+    """
+    Plays one game with a SearchAgent and returns the measurements of the
+    searches it ran.  status is 'ok', 'timeout' or 'error'.
+    """
+    records = []
+    search.enableMetrics(records.append, layout=layoutName)
+    result = {'layout': layoutName, 'problem': problem, 'algorithm': algorithm, 'heuristic': heuristic}
+    stdout = sys.stdout
+    sys.stdout = _NullWriter()
+    try:
+        try:
+            random.seed('cs188')
+            lay = layout.getLayout(layoutName)
+            agent = searchAgents.SearchAgent(fn=algorithm, prob=problem, heuristic=heuristic)
+            ghosts = [ghostAgents.RandomGhost(i + 1) for i in range(lay.getNumGhosts())]
+            game = ClassicGameRules(timeout).newGame(lay, agent, ghosts, textDisplay.NullGraphics(), quiet=True)
+            util.TimeoutFunction(game.run, timeout)()
+            result['status'] = 'ok'
+            result['win'] = game.state.isWin()
+        except util.TimeoutFunctionException:
+            result['status'] = 'timeout'
+        except Exception, e:
+            result['status'] = 'error'
+            result['error'] = '%s: %s' % (e.__class__.__name__, e)
+    finally:
+        sys.stdout = stdout
+        search.enableMetrics(None)
+
+    if result['status'] == 'ok':
+        result['searchTime'] = sum([r['totalTime'] for r in records])
+        result['expanded'] = sum([r['expanded'] for r in records])
+        result['peakNodes'] = max([r['maxFrontier'] + r['maxClosed'] for r in records] + [0])
+        result['solutionLength'] = sum([r['solutionLength'] or 0 for r in records])
+    return result
+
+def runBenchmark(layoutNames, algorithms=ALGORITHMS, heuristics=HEURISTICS, timeout=60, repeat=1, report=None):
+    """
+    Runs every combination and returns a dictionary from result keys to
+    results.  With repeat > 1 each combination runs several times and the
+    fastest run is kept, along with the number of runs it was chosen from.
+    report, if given, is called with each result.
+    """
+    results = {}
+    for combination in combinations(layoutNames, algorithms, heuristics):
+        best = None
+        for i in range(repeat):
+            result = runIsolated(*combination, **{'timeout': timeout})
+            if result['status'] != 'ok':
+                best = result
+                break
+            if best is None or result['searchTime'] < best['searchTime']:
+                best = result
+        best['repeat'] = repeat
+        results[resultKey(*combination)] = best
+        if report is not None: report(best)
+    return results
+
+def loadBaseline(path=BASELINE_FILE):
+    "Returns the stored results, or None if there is no baseline file"
+    import json
+    if not os.path.exists(path): return None
+    f = open(path)
+    try: return json.load(f)['results']
+    finally: f.close()
+
+def saveBaseline(results, path=BASELINE_FILE):
+    import json
+    f = open(path, 'w')
+    try:
+        json.dump({'results': results}, f, indent=1, sort_keys=True)
+        f.write('\n')
+    finally:
+        f.close()
+
+def compareResults(results, baseline, threshold):
+    """
+    Returns a list of (key, measure, baselineValue, value) for every
+    measurement that grew by more than the given fraction over the
+    baseline.  A combination that finished in the baseline but not any
+    more is reported with measure 'status'.  Combinations missing from the
+    baseline are skipped here; see unmatchedResults.  Measurements either
+    side lacks are skipped too, as are search times of results that are
+    not the best of MIN_TIMING_REPEAT runs.
+    """
+    regressions = []
+    for key in sorted(results):
+        if key not in baseline: continue
+        old, new = baseline[key], results[key]
+        if old['status'] == 'ok' and new['status'] != 'ok':
+            regressions.append((key, 'status', old['status'], new['status']))
+            continue
+        if new['status'] != 'ok' or old['status'] != 'ok': continue
+        timed = min(old.get('repeat', 1), new.get('repeat', 1)) >= MIN_TIMING_REPEAT
+        for measure in MEASURES:
+            if old.get(measure) is None or new.get(measure) is None: continue
+            if new[measure] <= old[measure] * (1 + threshold): continue
+            if measure == 'searchTime' and (not timed or new[measure] - old[measure] < MIN_TIME_DIFFERENCE): continue
+            if measure == 'peakMemoryKB' and new[measure] - old[measure] < MIN_MEMORY_DIFFERENCE: continue
+            regressions.append((key, measure, old[measure], new[measure]))
+    return regressions
+
+def unmatchedResults(results, baseline):
+    "Returns the keys of the results the baseline has no entry for"
+    return [key for key in sorted(results) if key not in baseline]
+
+def formatResult(result):
+    name = resultKey(result['layout'], result['problem'], result['algorithm'], result['heuristic'])
+    if result['status'] != 'ok':
+        return '%-70s %s %s' % (name, result['status'], result.get('error', ''))
+    line = '%-70s %8.3fs %9d expanded %9d nodes' % (name, result['searchTime'], result['expanded'], result['peakNodes'])
+    if result.get('peakMemoryKB') is not None:
+        line += ' %8d KB' % result['peakMemoryKB']
+    return line
+
+def bundledLayouts():
+    layoutDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'layouts')
+    return sorted([f[:-4] for f in os.listdir(layoutDir) if f.endswith('.lay')])
+
+def readCommand(argv):
+    from optparse import OptionParser
+    usageStr = """
+    USAGE:      python benchmark.py <options>
+    EXAMPLES:   (1) python benchmark.py --save
+                    - records a baseline for all layouts and algorithms
+                (2) python benchmark.py -l tinyMaze,mediumMaze -f bfs,astar
+                    - compares two layouts and algorithms against the baseline
+    """
+    parser = OptionParser(usageStr)
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='Comma separated layouts to run (default: all bundled layouts)')
+    parser.add_option('-f', '--functions', dest='algorithms', default=','.join(ALGORITHMS),
+                      help='Comma separated search functions to run [Default: %default]')
+    parser.add_option('-e', '--heuristics', dest='heuristics', default=','.join(HEURISTICS),
+                      help='Comma separated heuristics for A* [Default: %default]')
+    parser.add_option('-b', '--baseline', dest='baseline', default=BASELINE_FILE,
+                      help='The baseline file [Default: %default]')
+    parser.add_option('-s', '--save', action='store_true', dest='save', default=False,
+                      help='Stores the results as the new baseline instead of comparing')
+    parser.add_option('-t', '--threshold', type='float', dest='threshold', default=0.2,
+                      help='Fraction a measurement may grow before it is a regression [Default: %default]')
+    parser.add_option('-r', '--repeat', type='int', dest='repeat', default=3,
+                      help='Runs per combination; the fastest is kept, and times are compared from %d runs up [Default: %%default]' % MIN_TIMING_REPEAT)
+    parser.add_option('--timeout', type='int', dest='timeout', default=60,
+                      help='Seconds allowed per combination [Default: %default]')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    if options.layouts is None:
+        options.layouts = bundledLayouts()
+    else:
+        options.layouts = options.layouts.split(',')
+    options.algorithms = options.algorithms.split(',')
+    options.heuristics = options.heuristics.split(',')
+    return options
+
+def printResult(result):
+    print formatResult(result)
+    sys.stdout.flush()
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    results = runBenchmark(options.layouts, options.algorithms, options.heuristics,
+                           options.timeout, options.repeat, printResult)
+    if options.save:
+        baseline = loadBaseline(options.baseline) or {}
+        baseline.update(results)
+        saveBaseline(baseline, options.baseline)
+        print 'Stored %d results in %s' % (len(results), options.baseline)
+        sys.exit(0)
+
+    baseline = loadBaseline(options.baseline)
+    if baseline is None:
+        print 'No baseline in %s; run with --save to record one' % options.baseline
+        sys.exit(0)
+    regressions = compareResults(results, baseline, options.threshold)
+    unmatched = unmatchedResults(results, baseline)
+    for key, measure, old, new in regressions:
+        print 'REGRESSION %s %s: %s -> %s' % (key, measure, old, new)
+    for key in unmatched:
+        print 'NO BASELINE %s' % key
+    print '%d combinations, %d regressions, %d without a baseline' % (len(results), len(regressions), len(unmatched))
+    sys.exit(len(regressions) > 0 and 1 or 0)
@@ -0,0 +1,198 @@
+# distanceCalculator.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+This file contains a Distancer object which computes and caches the shortest
+path between any two points in a maze.
+
+The distances are computed once per maze with a breadth first search from
+every open cell and stored as a flat int16 matrix.  Matrices are kept in
+memory for the lifetime of the process and persisted to CACHE_DIR, so later
+runs on the same maze only have to read them back from disk.
+
+The matrix takes 2 * numCells**2 bytes, so it is only built for mazes with
+at most MAX_MATRIX_CELLS open cells (about 32MB at the cap).  Larger mazes
+get their distances one source at a time instead: a breadth first search
+runs the first time a cell is asked about and its row is kept, up to
+MAX_CACHED_ROWS rows per maze, and nothing is written to disk.
+
+Example:
+distancer = getDistancer(gameState.data.layout)
+distancer.getDistance( (1,1), (10,10) )
+"""
+
+import array
+import hashlib
+import os
+from collections import deque, OrderedDict
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.distances')
+UNREACHABLE = -1
+# Mazes with more open cells than this get lazily computed rows, not a matrix
+MAX_MATRIX_CELLS = 4000
+# The most rows a lazy Distancer keeps before dropping the oldest
+MAX_CACHED_ROWS = 1000
+
+# Maps layout keys to Distancer objects
+distanceMap = {}
+# Maps the rows of every layout text seen to its Distancer.  Copies of a
+# layout share their row strings, whose hashes Python keeps, so finding
+# the distancer of a copy does not hash the whole maze again
+textMap = {}
+
+class Distancer:
+    """
+    An all-pairs maze distance oracle for a single layout.  Open cells are
+    numbered column by column and the distance between cells i and j is
+    stored at distances[i * numCells + j] (UNREACHABLE if there is no path).
+    Above MAX_MATRIX_CELLS open cells distances is None and the row of
+    each source is computed on demand and kept in rows.
+    """
+
+    def __init__(self, layout, cacheDir=CACHE_DIR):
+        walls = layout.walls
+        self.key = layoutKey(layout.layoutText)
+        self.cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.cellIndex = dict((cell, i) for i, cell in enumerate(self.cells))
+        self.numCells = len(self.cells)
+        self.neighbors = cellNeighbors(self.cells, self.cellIndex)
+        self.rows = None
+
+        if self.numCells > MAX_MATRIX_CELLS:
+            self.distances = None
+            self.rows = OrderedDict()
+            return
+        self.distances = readDistances(cacheDir, self.key, self.numCells)
+        if self.distances is None:
+            self.distances = computeDistances(self.neighbors)
+            writeDistances(cacheDir, self.key, self.distances)
+
+    def getRow(self, source):
+        """
+        Returns the distances from the cell numbered source to every cell,
+        as a slice of the matrix or from the row cache.
+        """
+        n = self.numCells
+        if self.distances is not None:
+            return self.distances[source * n:(source + 1) * n]
+        row = self.rows.get(source)
+        if row is None:
+            if len(self.rows) >= MAX_CACHED_ROWS:
+                self.rows.popitem(last=False)
+            row = self.rows[source] = breadthFirstRow(self.neighbors, source)
+        return row
+
+    def getDistance(self, pos1, pos2):
+        """
+        Returns the maze distance between two open cells, or None if one
+        cannot be reached from the other.
+        """
+        i, j = self.cellIndex[pos1], self.cellIndex[pos2]
+        if self.distances is not None:
+            d = self.distances[i * self.numCells + j]
+        elif j in self.rows and i not in self.rows:
+            # Distances are symmetric, so any cached row will do
+            d = self.rows[j][i]
+        else:
+            d = self.getRow(i)[j]
+        if d == UNREACHABLE: return None
+        return d
+
+    def getDistancesFrom(self, pos):
+        """
+        Returns a dictionary mapping every cell reachable from pos to its
+        maze distance from pos.
+        """
+        row = self.getRow(self.cellIndex[pos])
+        return dict((self.cells[j], d) for j, d in enumerate(row) if d != UNREACHABLE)
+
+def getDistancer(layout, cacheDir=CACHE_DIR):
+    """
+    Returns the Distancer for the maze of the layout, building (or loading)
+    it on first use.  Game states deep copy their layout on every move, so
+    distancers are shared by maze rather than by layout object.
+    """
+    text = tuple(layout.layoutText)
+    distancer = textMap.get(text)
+    if distancer is None:
+        key = layoutKey(layout.layoutText)
+        if key not in distanceMap:
+            distanceMap[key] = Distancer(layout, cacheDir)
+        distancer = textMap[text] = distanceMap[key]
+    return distancer
+
+def layoutKey(layoutText):
+    """
+    Returns a hash of the maze in layoutText.  Only walls affect distances,
+    so layouts that differ just in food, capsules or agents share a key.
+    """
+    maze = '\n'.join([''.join([c == '%' and '%' or ' ' for c in row]) for row in layoutText])
+    return hashlib.md5(maze).hexdigest()
+
+def cellNeighbors(cells, cellIndex):
+    "Returns the numbers of the open cells next to each open cell"
+    neighbors = []
+    for x, y in cells:
+        adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+        neighbors.append([cellIndex[c] for c in adjacent if c in cellIndex])
+    return neighbors
+
+def breadthFirstRow(neighbors, source):
+    "Returns the distances from the cell numbered source to every cell"
+    row = array.array('h', [UNREACHABLE]) * len(neighbors)
+    row[source] = 0
+    fringe = deque([source])
+    while fringe:
+        i = fringe.popleft()
+        d = row[i] + 1
+        for j in neighbors[i]:
+            if row[j] == UNREACHABLE:
+                row[j] = d
+                fringe.append(j)
+    return row
+
+def computeDistances(neighbors):
+    "Runs a breadth first search from every open cell"
+    distances = array.array('h')
+    for source in range(len(neighbors)):
+        distances.extend(breadthFirstRow(neighbors, source))
+    return distances
+
+def _cachePath(cacheDir, key):
+    return os.path.join(cacheDir, key + '.dist')
+
+def readDistances(cacheDir, key, numCells):
+    "Loads a cached matrix, or returns None if there is no usable one"
+    path = _cachePath(cacheDir, key)
+    if not os.path.exists(path): return None
+    if os.path.getsize(path) != numCells * numCells * array.array('h').itemsize: return None
+    distances = array.array('h')
+    f = open(path, 'rb')
+    try: distances.fromfile(f, numCells * numCells)
+    except (IOError, EOFError): return None
+    finally: f.close()
+    return distances
+
+def writeDistances(cacheDir, key, distances):
+    "Stores a matrix on disk.  The cache is best effort, so failures are ignored."
+    path = _cachePath(cacheDir, key)
+    tmpPath = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        if not os.path.isdir(cacheDir): os.makedirs(cacheDir)
+        f = open(tmpPath, 'wb')
+        try: distances.tofile(f)
+        finally: f.close()
+        os.rename(tmpPath, path)
+    except (IOError, OSError):
+        if os.path.exists(tmpPath): os.remove(tmpPath)
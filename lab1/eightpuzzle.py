@@ -14,13 +14,16 @@
 
 import search
 import random
+import patterndb
+from collections import deque
 
 # Module Classes
 
 class EightPuzzleState:
     """
     The Eight Puzzle is described in the course textbook on
-    page 64.
+    page 64.  Boards of other sizes work the same way; the fifteen puzzle
+    is built from the numbers 0 to 15.
 
     This class defines the mechanics of the puzzle itself.  The
     task of recasting this puzzle as a search problem is left to
@@ -47,14 +50,16 @@ class EightPuzzleState:
             ------------
 
         The configuration of the puzzle is stored in a 2-dimensional
-        list (a list of lists) 'cells'.
+        list (a list of lists) 'cells'.  The side of the board is the
+        square root of the number of numbers.
         """
+        self.size = int(round(len(numbers) ** 0.5))
         self.cells = []
         numbers = numbers[:] # Make a copy so as not to cause side-effects.
         numbers.reverse()
-        for row in range( 3 ):
+        for row in range( self.size ):
             self.cells.append( [] )
-            for col in range( 3 ):
+            for col in range( self.size ):
                 self.cells[row].append( numbers.pop() )
                 if self.cells[row][col] == 0:
                     self.blankLocation = row, col
@@ -78,8 +83,8 @@ class EightPuzzleState:
         False
         """
         current = 0
-        for row in range( 3 ):
-            for col in range( 3 ):
+        for row in range( self.size ):
+            for col in range( self.size ):
                 if current != self.cells[row][col]:
                     return False
                 current += 1
@@ -99,11 +104,11 @@ class EightPuzzleState:
         row, col = self.blankLocation
         if(row != 0):
             moves.append('up')
-        if(row != 2):
+        if(row != self.size - 1):
             moves.append('down')
         if(col != 0):
             moves.append('left')
-        if(col != 2):
+        if(col != self.size - 1):
             moves.append('right')
         return moves
 
@@ -136,7 +141,7 @@ class EightPuzzleState:
             raise "Illegal Move"
 
         # Create a copy of the current eightPuzzle
-        newPuzzle = EightPuzzleState([0, 0, 0, 0, 0, 0, 0, 0, 0])
+        newPuzzle = EightPuzzleState([0] * (self.size * self.size))
         newPuzzle.cells = [values[:] for values in self.cells]
         # And update it to reflect the move
         newPuzzle.cells[row][col] = self.cells[newrow][newcol]
@@ -155,7 +160,7 @@ class EightPuzzleState:
               EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).result('left')
           True
         """
-        for row in range( 3 ):
+        for row in range( self.size ):
             if self.cells[row] != other.cells[row]:
                 return False
         return True
@@ -163,19 +168,34 @@ class EightPuzzleState:
     def __hash__(self):
         return hash(str(self.cells))
 
+    def tilePositions(self):
+        """
+          Returns a list holding the cell of every tile, the blank first.
+        Cells are numbered row by row, so tile t is home in cell t.
+
+        >>> EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).tilePositions()
+        [1, 0, 2, 3, 4, 5, 6, 7, 8]
+        """
+        positions = [0] * (self.size * self.size)
+        for row in range( self.size ):
+            for col in range( self.size ):
+                positions[self.cells[row][col]] = row * self.size + col
+        return positions
+
     def __getAsciiString(self):
         """
           Returns a display string for the maze
         """
         lines = []
-        horizontalLine = ('-' * (13))
+        width = len(str(self.size * self.size - 1))
+        horizontalLine = ('-' * ((width + 3) * self.size + 1))
         lines.append(horizontalLine)
         for row in self.cells:
             rowLine = '|'
             for col in row:
                 if col == 0:
                     col = ' '
-                rowLine = rowLine + ' ' + col.__str__() + ' |'
+                rowLine = rowLine + ' ' + col.__str__().rjust(width) + ' |'
             lines.append(rowLine)
             lines.append(horizontalLine)
         return '\n'.join(lines)
@@ -183,20 +203,182 @@ class EightPuzzleState:
     def __str__(self):
         return self.__getAsciiString()
 
+class PackedPuzzleState:
+    """
+    A sliding puzzle of up to 4x4 packed into a single integer, with the
+    tile in cell i (cells numbered row by row) stored in bits 4*i to 4*i+3.
+    It offers the interface of EightPuzzleState, but a move only shifts
+    the bits of one tile instead of copying the board, and the hash is
+    computed once per state.
+    """
+    def __init__(self, size, board, blank):
+        self.size = size
+        self.board = board
+        self.blank = blank
+        self.blankLocation = divmod(blank, size)
+        self._hash = None
+
+    def fromNumbers(numbers):
+        """
+        Packs a list of numbers given in the order EightPuzzleState takes
+        them.
+
+        >>> print PackedPuzzleState.fromNumbers([1, 0, 2, 3, 4, 5, 6, 7, 8]).result('left')
+        -------------
+        |   | 1 | 2 |
+        -------------
+        | 3 | 4 | 5 |
+        -------------
+        | 6 | 7 | 8 |
+        -------------
+        """
+        board = 0
+        for cell, tile in enumerate(numbers):
+            board |= tile << (4 * cell)
+        return PackedPuzzleState(int(round(len(numbers) ** 0.5)), board, list(numbers).index(0))
+    fromNumbers = staticmethod(fromNumbers)
+
+    def fromPuzzle(puzzle):
+        "Packs an EightPuzzleState; a packed state is returned as it is"
+        if isinstance(puzzle, PackedPuzzleState): return puzzle
+        return PackedPuzzleState.fromNumbers([tile for row in puzzle.cells for tile in row])
+    fromPuzzle = staticmethod(fromPuzzle)
+
+    def numbers(self):
+        "Returns the tile in every cell, in the order EightPuzzleState takes them"
+        return [(self.board >> (4 * cell)) & 15 for cell in range(self.size * self.size)]
+
+    def isGoal(self):
+        """
+        >>> PackedPuzzleState.fromNumbers([0, 1, 2, 3, 4, 5, 6, 7, 8]).isGoal()
+        True
+        """
+        return self.board == goalBoard(self.size)
+
+    def legalMoves(self):
+        "Returns the legal moves in the order EightPuzzleState.legalMoves does"
+        moves = []
+        row, col = self.blankLocation
+        if row != 0: moves.append('up')
+        if row != self.size - 1: moves.append('down')
+        if col != 0: moves.append('left')
+        if col != self.size - 1: moves.append('right')
+        return moves
+
+    def result(self, move):
+        """
+        Returns the state after moving the blank.  The tile it swaps with is
+        moved by adding and subtracting its value at the two cells; the
+        blank's bits are zero, so nothing else changes.
+        """
+        if move == 'up': next = self.blank - self.size
+        elif move == 'down': next = self.blank + self.size
+        elif move == 'left': next = self.blank - 1
+        elif move == 'right': next = self.blank + 1
+        else: raise Exception, 'Illegal move: %s' % move
+        tile = (self.board >> (4 * next)) & 15
+        board = self.board + (tile << (4 * self.blank)) - (tile << (4 * next))
+        return PackedPuzzleState(self.size, board, next)
+
+    def tilePositions(self):
+        "Returns a list holding the cell of every tile, the blank first"
+        positions = [0] * (self.size * self.size)
+        board = self.board
+        for cell in range(self.size * self.size):
+            positions[board & 15] = cell
+            board >>= 4
+        return positions
+
+    def rank(self):
+        """
+        Returns a perfect hash of the board from 0 to (size*size)! - 1:
+        the cell of the blank, followed by the index of the other tiles
+        (in reading order) among their permutations in lexicographic order.
+        unrankPuzzle turns it back into a state.  Swapping the last two
+        tiles only changes the lowest bit of the rank and, with the blank
+        in place, flips the solvability of the board, so rank() // 2
+        numbers the solvable boards densely.
+        """
+        numTiles = self.size * self.size - 1
+        tiles = [tile - 1 for tile in self.numbers() if tile != 0]
+        return self.blank * patterndb.numPlacements(numTiles, numTiles) + patterndb.rankPattern(tiles, numTiles)
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedPuzzleState): return False
+        return self.board == other.board and self.size == other.size
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.board)
+        return self._hash
+
+    def __str__(self):
+        return str(EightPuzzleState(self.numbers()))
+
+# Maps board sizes to the packed goal boards
+GOAL_BOARDS = {}
+
+def goalBoard(size):
+    "The packed board with the blank in cell 0 and every tile t in cell t"
+    if size not in GOAL_BOARDS:
+        GOAL_BOARDS[size] = PackedPuzzleState.fromNumbers(range(size * size)).board
+    return GOAL_BOARDS[size]
+
+def unrankPuzzle(rank, size=3):
+    """
+    Returns the PackedPuzzleState with the given rank.
+
+    >>> unrankPuzzle(PackedPuzzleState.fromNumbers([4, 3, 2, 7, 0, 5, 1, 6, 8]).rank()).numbers()
+    [4, 3, 2, 7, 0, 5, 1, 6, 8]
+    """
+    numTiles = size * size - 1
+    blank, rank = divmod(rank, patterndb.numPlacements(numTiles, numTiles))
+    numbers = [tile + 1 for tile in patterndb.unrankPattern(rank, numTiles, numTiles)]
+    numbers.insert(blank, 0)
+    return PackedPuzzleState.fromNumbers(numbers)
+
+def buildDistanceTable(size=3):
+    """
+    Returns a bytearray holding the number of moves from every solvable
+    board to the goal, at index state.rank() // 2, found by a breadth first
+    search backwards from the goal.  For the eight puzzle that is all
+    181440 boards in 181440 bytes; larger boards do not fit in memory.
+    """
+    numCells = size * size
+    table = bytearray([patterndb.UNKNOWN]) * (patterndb.numPlacements(numCells, numCells) // 2)
+    goal = PackedPuzzleState.fromNumbers(range(numCells))
+    table[goal.rank() // 2] = 0
+    fringe = deque([goal])
+    while fringe:
+        state = fringe.popleft()
+        d = table[state.rank() // 2] + 1
+        for move in state.legalMoves():
+            next = state.result(move)
+            index = next.rank() // 2
+            if table[index] == patterndb.UNKNOWN:
+                table[index] = d
+                fringe.append(next)
+    return table
+
 # TODO: Implement The methods in this class
 
 class EightPuzzleSearchProblem(search.SearchProblem):
     """
       Implementation of a SearchProblem for the  Eight Puzzle domain
 
-      Each state is represented by an instance of an eightPuzzle.
+      Each state is represented by a PackedPuzzleState; an EightPuzzleState
+      given as the puzzle is packed first.
     """
     def __init__(self,puzzle):
         "Creates a new EightPuzzleSearchProblem which stores search information."
-        self.puzzle = puzzle
+        self.puzzle = PackedPuzzleState.fromPuzzle(puzzle)
+        self.heuristicInfo = {} # A dictionary for the heuristic to store information
 
     def getStartState(self):
-        return puzzle
+        return self.puzzle
 
     def isGoalState(self,state):
         return state.isGoal()
@@ -221,6 +403,23 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         """
         return len(actions)
 
+def patternDatabaseHeuristic(state, problem):
+    """
+      The sum of the disjoint pattern databases of the board size (see
+    patterndb.py), an admissible and consistent heuristic for the eight and
+    fifteen puzzles.  The databases are built on the first call, or mapped
+    from their files if an earlier run built them.
+
+    >>> patternDatabaseHeuristic(EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]), EightPuzzleSearchProblem(loadEightPuzzle(0)))
+    1
+    """
+    databases = problem.heuristicInfo.get('patternDatabases')
+    if databases is None:
+        databases = patterndb.getPatternDatabases(state.size)
+        problem.heuristicInfo['patternDatabases'] = databases
+    positions = state.tilePositions()
+    return sum([db.lookup(positions) for db in databases])
+
 EIGHT_PUZZLE_DATA = [[1, 0, 2, 3, 4, 5, 6, 7, 8],
                      [1, 7, 8, 2, 3, 4, 5, 6, 0],
                      [4, 3, 2, 7, 0, 5, 1, 6, 8],
@@ -248,15 +447,16 @@ def loadEightPuzzle(puzzleNumber):
     """
     return EightPuzzleState(EIGHT_PUZZLE_DATA[puzzleNumber])
 
-def createRandomEightPuzzle(moves=100):
+def createRandomEightPuzzle(moves=100, size=3):
     """
       moves: number of random moves to apply
+      size: side of the board (4 for the fifteen puzzle)
 
       Creates a random eight puzzle by applying
       a series of 'moves' random moves to a solved
-      puzzle.
+      puzzle.  The puzzle is a PackedPuzzleState.
     """
-    puzzle = EightPuzzleState([0,1,2,3,4,5,6,7,8])
+    puzzle = PackedPuzzleState.fromNumbers(range(size * size))
     for i in range(moves):
         # Execute a random legal move
         puzzle = puzzle.result(random.sample(puzzle.legalMoves(), 1)[0])
@@ -22,6 +22,7 @@
 
 from util import *
 import time, os
+import random
 import traceback
 import sys
 
@@ -159,6 +160,38 @@ class AgentState:
     def getDirection(self):
         return self.configuration.getDirection()
 
+ZOBRIST_KEYS = []
+ZOBRIST_BLOCK = 1024
+
+def zobristKeys(size):
+    """
+    Returns the table of random 64-bit Zobrist keys, extended to at least
+    size entries.  The cell (x,y) of a grid of the given height uses the key
+    at index x * height + y.  The table grows in blocks, each drawn from a
+    private generator seeded with the block number, so the keys are the same
+    in every run and the global random state is left alone.
+    """
+    while len(ZOBRIST_KEYS) < size:
+        rng = random.Random(len(ZOBRIST_KEYS) / ZOBRIST_BLOCK)
+        ZOBRIST_KEYS.extend([rng.getrandbits(64) for i in range(ZOBRIST_BLOCK)])
+    return ZOBRIST_KEYS
+
+class GridColumn(list):
+    """
+    A column of a Grid.  Writes through grid[x][y] = value land here and keep
+    the Zobrist hash of the grid in sync by toggling the key of the cell
+    whenever its truth value changes.  Reads are plain list reads.
+    """
+    def __init__(self, values, zobrist, base):
+        list.__init__(self, values)
+        self.zobrist = zobrist
+        self.base = base
+
+    def __setitem__(self, y, value):
+        if (not list.__getitem__(self, y)) != (not value):
+            self.zobrist[0] ^= ZOBRIST_KEYS[self.base + y]
+        list.__setitem__(self, y, value)
+
 class Grid:
     """
     A 2-dimensional array of objects backed by a list of lists.  Data is accessed
@@ -166,6 +199,9 @@ class Grid:
     y vertical and the origin (0,0) in the bottom left corner.
 
     The __str__ method constructs an output that is oriented like a pacman board.
+
+    The grid maintains a 64-bit Zobrist hash (the XOR of the keys of all true
+    cells) as it is written to, so hashing a grid is O(1).
     """
     def __init__(self, width, height, initialValue=False, bitRepresentation=None):
         if initialValue not in [False, True]: raise Exception('Grids can only contain booleans')
@@ -173,7 +209,13 @@ class Grid:
 
         self.width = width
         self.height = height
-        self.data = [[initialValue for y in range(height)] for x in range(width)]
+        keys = zobristKeys(width * height)
+        # Shared with shallow copies, which share the columns as well
+        self._zobrist = [0]
+        if initialValue:
+            for key in keys[:width * height]:
+                self._zobrist[0] ^= key
+        self.data = [GridColumn([initialValue] * height, self._zobrist, x * height) for x in range(width)]
         if bitRepresentation:
             self._unpackBits(bitRepresentation)
 
@@ -181,7 +223,12 @@ class Grid:
         return self.data[i]
 
     def __setitem__(self, key, item):
-        self.data[key] = item
+        old = self.data[key]
+        base = key * self.height
+        for y in range(self.height):
+            if (not old[y]) != (not item[y]):
+                self._zobrist[0] ^= ZOBRIST_KEYS[base + y]
+        self.data[key] = GridColumn(item, self._zobrist, base)
 
     def __str__(self):
         out = [[str(self.data[x][y])[0] for x in range(self.width)] for y in range(self.height)]
@@ -193,27 +240,32 @@ class Grid:
         return self.data == other.data
 
     def __hash__(self):
-        # return hash(str(self))
-        base = 1
-        h = 0
-        for l in self.data:
-            for i in l:
-                if i:
-                    h += base
-                base *= 2
-        return hash(h)
+        return self._zobrist[0]
+
+    def zobrist(self):
+        "Returns the 64-bit Zobrist hash of the grid"
+        return self._zobrist[0]
+
+    def _emptyCopy(self):
+        "Returns a Grid of the same size whose data is left for the caller to fill in"
+        g = Grid(0, 0)
+        g.width, g.height = self.width, self.height
+        return g
 
     def copy(self):
-        g = Grid(self.width, self.height)
-        g.data = [x[:] for x in self.data]
+        g = self._emptyCopy()
+        g._zobrist[0] = self._zobrist[0]
+        height = self.height
+        g.data = [GridColumn(column, g._zobrist, x * height) for x, column in enumerate(self.data)]
         return g
 
     def deepCopy(self):
         return self.copy()
 
     def shallowCopy(self):
-        g = Grid(self.width, self.height)
+        g = self._emptyCopy()
         g.data = self.data
+        g._zobrist = self._zobrist
         return g
 
     def count(self, item =True ):
@@ -274,6 +326,112 @@ class Grid:
                 bools.append(False)
         return bools
 
+class BitGrid:
+    """
+    An immutable grid of booleans packed into a single integer, with the cell
+    (x,y) stored in bit x * height + y.  It offers the read-only part of the
+    Grid interface (count, asList, grid[x][y] or get) and is meant for search
+    states that hold a food grid: removing a dot creates a new BitGrid in
+    O(1) without copying any lists, and updates its Zobrist hash in O(1).
+    """
+    def __init__(self, width, height, bits=0):
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self._hash = None
+        self._count = None
+
+    def fromGrid(grid):
+        "Packs a Grid into a BitGrid"
+        bits = 0
+        for index, cell in enumerate([cell for column in grid.data for cell in column]):
+            if cell: bits |= 1 << index
+        g = BitGrid(grid.width, grid.height, bits)
+        g._hash = grid.zobrist()
+        return g
+    fromGrid = staticmethod(fromGrid)
+
+    def get(self, x, y):
+        return (self.bits >> (x * self.height + y)) & 1 == 1
+
+    def __getitem__(self, x):
+        "Returns a read-only view of column x, so grid[x][y] reads like a Grid"
+        if x < 0: x += self.width
+        if not 0 <= x < self.width: raise IndexError('column index out of range')
+        return BitGridColumn(self.bits >> (x * self.height), self.height)
+
+    def without(self, x, y):
+        """
+        Returns a BitGrid with the cell (x,y) cleared.  If the cell is
+        already empty the grid itself is returned.
+        """
+        bit = 1 << (x * self.height + y)
+        if not self.bits & bit: return self
+        g = BitGrid(self.width, self.height, self.bits ^ bit)
+        if self._count is not None: g._count = self._count - 1
+        if self._hash is not None: g._hash = self._hash ^ ZOBRIST_KEYS[x * self.height + y]
+        return g
+
+    def count(self, item=True):
+        if self._count is None:
+            self._count = bin(self.bits).count('1')
+        if item: return self._count
+        return self.width * self.height - self._count
+
+    def asList(self, key=True):
+        "Returns the set cells in the same order as Grid.asList"
+        if not key:
+            return [(x, y) for x in range(self.width) for y in range(self.height) if not self.get(x, y)]
+        cells = []
+        bits = self.bits
+        height = self.height
+        while bits:
+            low = bits & -bits
+            index = low.bit_length() - 1
+            cells.append((index / height, index % height))
+            bits ^= low
+        return cells
+
+    def toGrid(self):
+        g = Grid(self.width, self.height)
+        for x, y in self.asList():
+            g[x][y] = True
+        return g
+
+    def __eq__(self, other):
+        if not isinstance(other, BitGrid): return False
+        return self.bits == other.bits and self.width == other.width and self.height == other.height
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        "The Zobrist hash, equal to that of a Grid with the same cells"
+        if self._hash is None:
+            keys = zobristKeys(self.width * self.height)
+            h = 0
+            for x, y in self.asList():
+                h ^= keys[x * self.height + y]
+            self._hash = h
+        return self._hash
+
+    def __str__(self):
+        return str(self.toGrid())
+
+class BitGridColumn:
+    "One column of a BitGrid, indexed by y"
+    def __init__(self, bits, height):
+        self.bits = bits
+        self.height = height
+
+    def __getitem__(self, y):
+        if y < 0: y += self.height
+        if not 0 <= y < self.height: raise IndexError('row index out of range')
+        return (self.bits >> y) & 1 == 1
+
+    def __len__(self):
+        return self.height
+
 def reconstituteGrid(bitRep):
     if type(bitRep) is not type((1,2)):
         return bitRep
@@ -368,6 +526,12 @@ class Actions:
         return (x + dx, y + dy)
     getSuccessor = staticmethod(getSuccessor)
 
+HASH_MASK = (1 << 64) - 1
+# Odd 64-bit multipliers that spread agent and score hashes over all 64 bits
+AGENT_HASH_MULTIPLIERS = [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+                          0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53]
+SCORE_HASH_MULTIPLIER = 0x94D049BB133111EB
+
 class GameStateData:
     """
 
@@ -383,6 +547,7 @@ class GameStateData:
             self.layout = prevState.layout
             self._eaten = prevState._eaten
             self.score = prevState.score
+            self._capsuleZobrist = prevState._capsuleZobrist
 
         self._foodEaten = None
         self._foodAdded = None
@@ -423,14 +588,30 @@ class GameStateData:
     def __hash__( self ):
         """
         Allows states to be keys of dictionaries.
+
+        The food grid and the capsules keep Zobrist hashes up to date as they
+        change, so only the handful of agent states and the score are hashed
+        here.  The result is a full 64-bit value.
         """
+        h = self.food.zobrist() ^ self._capsuleZobrist
         for i, state in enumerate( self.agentStates ):
-            try:
-                int(hash(state))
-            except TypeError, e:
-                print e
-                #hash(state)
-        return int((hash(tuple(self.agentStates)) + 13*hash(self.food) + 113* hash(tuple(self.capsules)) + 7 * hash(self.score)) % 1048575 )
+            h ^= (hash(state) * AGENT_HASH_MULTIPLIERS[i % len(AGENT_HASH_MULTIPLIERS)]) & HASH_MASK
+        return h ^ ((hash(self.score) * SCORE_HASH_MULTIPLIER) & HASH_MASK)
+
+    def capsuleKey( self, position ):
+        """
+        Returns the Zobrist key of a capsule position.  Capsules use a second
+        plane of keys after the ones used for food cells.
+        """
+        x, y = position
+        height = self.layout.height
+        size = self.layout.width * height
+        return zobristKeys(2 * size)[size + x * height + y]
+
+    def removeCapsule( self, position ):
+        "Removes a capsule, keeping the capsule hash in sync"
+        self.capsules.remove( position )
+        self._capsuleZobrist ^= self.capsuleKey( position )
 
     def __str__( self ):
         width, height = self.layout.width, self.layout.height
@@ -492,6 +673,9 @@ class GameStateData:
         #self.capsules = []
         self.capsules = layout.capsules[:]
         self.layout = layout
+        self._capsuleZobrist = 0
+        for capsule in self.capsules:
+            self._capsuleZobrist ^= self.capsuleKey( capsule )
         self.score = 0
         self.scoreChange = 0
 
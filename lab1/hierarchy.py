@@ -0,0 +1,191 @@
+# hierarchy.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A hierarchical abstraction of a maze for HPA* (hierarchical path-finding A*).
+
+The grid is cut into square clusters.  Wherever open cells face each other
+across the border of two clusters there is an entrance; its cells become
+nodes of an abstract graph, joined by a unit-cost edge across the border
+and by edges to the other nodes of the same cluster weighted with their
+maze distance inside the cluster.  A search over this small graph finds a
+route from cluster to cluster, and each edge of the route is then refined
+into moves by a search confined to a single cluster.
+
+Paths found this way are usually a little longer than the shortest ones,
+in exchange for searching far fewer states on big mazes.
+
+Example:
+graph = getClusterGraph(gameState.getWalls()).withEndpoints([start, goal])
+route = ... a search over graph.edges from start to goal ...
+actions = graph.refine(start, route)
+"""
+
+import copy
+import util
+from collections import deque
+
+# The side length of a cluster, in cells
+CLUSTER_SIZE = 10
+# Entrances at least this wide get a node at each end instead of one in
+# the middle
+WIDE_ENTRANCE = 6
+
+# Maps (width, height, hash of the walls, clusterSize) to the walls and
+# their ClusterGraph (see util.cachedForWalls)
+clusterMap = {}
+
+class ClusterGraph:
+    """
+    The abstract graph of a maze.  edges maps every node to a dictionary
+    from its neighbours to the cost of the edge between them, and
+    clusterNodes maps every cluster, as (column, row), to its nodes.
+    """
+
+    def __init__(self, walls, clusterSize=CLUSTER_SIZE):
+        self.walls = walls
+        self.clusterSize = clusterSize
+        self.edges = {}
+        self.clusterNodes = {}
+        self.findEntrances()
+        for nodes in self.clusterNodes.values():
+            for node in nodes:
+                distances = self.clusterDistances(node)
+                for other in nodes:
+                    if other != node and other in distances:
+                        self.edges[node][other] = distances[other]
+
+    def clusterOf(self, cell):
+        return (cell[0] // self.clusterSize, cell[1] // self.clusterSize)
+
+    def findEntrances(self):
+        """
+        Scans every border between two clusters for runs of open cells
+        facing open cells on the other side, and adds a node pair for
+        each run (two for wide ones).
+        """
+        walls, size = self.walls, self.clusterSize
+        for border in range(size, walls.width, size):
+            for row in range(0, walls.height, size):
+                cells = [((border - 1, y), (border, y)) for y in range(row, min(row + size, walls.height))]
+                self.addEntrances(cells)
+        for border in range(size, walls.height, size):
+            for column in range(0, walls.width, size):
+                cells = [((x, border - 1), (x, border)) for x in range(column, min(column + size, walls.width))]
+                self.addEntrances(cells)
+
+    def addEntrances(self, pairs):
+        "Adds the entrances along one border, given as the pairs of cells facing each other"
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and not self.walls[a[0]][a[1]] and not self.walls[b[0]][b[1]]:
+                run.append((a, b))
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions = [run[0], run[-1]]
+            elif run:
+                transitions = [run[len(run) // 2]]
+            else:
+                transitions = []
+            for a2, b2 in transitions:
+                self.addNode(a2)
+                self.addNode(b2)
+                self.edges[a2][b2] = self.edges[b2][a2] = 1
+            run = []
+
+    def addNode(self, cell):
+        if cell not in self.edges:
+            self.edges[cell] = {}
+            self.clusterNodes.setdefault(self.clusterOf(cell), []).append(cell)
+
+    def clusterDistances(self, source, parents=None):
+        """
+        Runs a breadth first search from source that never leaves its
+        cluster and returns the distances of the cells it reaches.  If a
+        dictionary of parents is given, it is filled with the (cell, action)
+        each reached cell was entered from.
+        """
+        from game import Directions
+        walls, cluster = self.walls, self.clusterOf(source)
+        moves = [((0, 1), Directions.NORTH), ((0, -1), Directions.SOUTH),
+                 ((1, 0), Directions.EAST), ((-1, 0), Directions.WEST)]
+        distances = {source: 0}
+        fringe = deque([source])
+        while fringe:
+            cell = fringe.popleft()
+            d = distances[cell] + 1
+            for (dx, dy), action in moves:
+                next = (cell[0] + dx, cell[1] + dy)
+                if next in distances or walls[next[0]][next[1]] or self.clusterOf(next) != cluster:
+                    continue
+                distances[next] = d
+                if parents is not None: parents[next] = (cell, action)
+                fringe.append(next)
+        return distances
+
+    def withEndpoints(self, cells):
+        """
+        Returns a graph in which the given cells (e.g. the start and goal of
+        a search) are nodes too, connected to the nodes of their clusters.
+        The graph itself is left untouched.
+        """
+        graph = copy.copy(self)
+        graph.edges = dict(self.edges)
+        graph.clusterNodes = dict(self.clusterNodes)
+        for cell in cells:
+            if cell in graph.edges: continue
+            cluster = graph.clusterOf(cell)
+            nodes = list(graph.clusterNodes.get(cluster, []))
+            distances = graph.clusterDistances(cell)
+            graph.edges[cell] = {}
+            for node in nodes:
+                if node not in distances: continue
+                graph.edges[cell][node] = distances[node]
+                graph.edges[node] = dict(graph.edges[node])
+                graph.edges[node][cell] = distances[node]
+            nodes.append(cell)
+            graph.clusterNodes[cluster] = nodes
+        return graph
+
+    def refine(self, start, route):
+        """
+        Turns a route through the abstract graph, given as the nodes visited
+        after start, into the list of Directions that walks it.
+        """
+        from game import Actions
+        actions = []
+        current = start
+        for node in route:
+            step = (node[0] - current[0], node[1] - current[1])
+            if abs(step[0]) + abs(step[1]) == 1:
+                actions.append(Actions.vectorToDirection(step))
+            else:
+                parents = {}
+                self.clusterDistances(current, parents)
+                path, cell = [], node
+                while cell != current:
+                    cell, action = parents[cell]
+                    path.append(action)
+                path.reverse()
+                actions.extend(path)
+            current = node
+        return actions
+
+def getClusterGraph(walls, clusterSize=CLUSTER_SIZE):
+    """
+    Returns the ClusterGraph of a maze, building it on first use.  Graphs
+    are shared by all problems on mazes with the same walls.
+    """
+    key = (walls.width, walls.height, hash(walls), clusterSize)
+    return util.cachedForWalls(clusterMap, key, walls, lambda: ClusterGraph(walls, clusterSize))
@@ -0,0 +1,114 @@
+# landmarks.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Landmark (ALT) lower bounds on maze distances.
+
+A handful of landmark cells are picked per maze and the maze distance from
+each landmark to every open cell is computed with one breadth first search
+per landmark.  By the triangle inequality, for any landmark L
+
+  dist(a, b) >= |dist(L, a) - dist(L, b)|
+
+and the largest of these bounds over all landmarks is a consistent
+heuristic for unit-cost moves.  Landmarks are chosen by farthest-point
+selection, so they end up on the edges of the maze, where the bound is
+tightest.  The tables take numLandmarks entries per cell instead of the
+numCells entries per cell of distanceCalculator's all-pairs matrix.
+
+Example:
+table = getLandmarkTable(gameState.getWalls())
+table.lowerBound( (1,1), (10,10) )
+"""
+
+import util
+from collections import deque
+
+# The number of landmarks chosen per maze by default
+NUM_LANDMARKS = 8
+
+# Maps (width, height, hash of the walls, numLandmarks) to the walls and
+# their LandmarkTable (see util.cachedForWalls)
+landmarkMap = {}
+
+class LandmarkTable:
+    """
+    Maze distances from a few landmark cells to every open cell.
+    distances[cell] is a tuple holding the distance from each landmark to
+    the cell, or None for landmarks in another part of a disconnected maze.
+    """
+
+    def __init__(self, walls, numLandmarks=NUM_LANDMARKS):
+        cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.landmarks = []
+        columns = []
+        # Distance from each cell to its nearest landmark so far
+        nearest = dict((cell, None) for cell in cells)
+        while cells and len(self.landmarks) < numLandmarks:
+            landmark = farthestCell(walls, cells, nearest)
+            if nearest[landmark] == 0:
+                # Every cell is a landmark already
+                break
+            column = distancesFrom(walls, landmark)
+            self.landmarks.append(landmark)
+            columns.append(column)
+            for cell, d in column.iteritems():
+                if nearest[cell] is None or d < nearest[cell]:
+                    nearest[cell] = d
+        self.distances = dict((cell, tuple([column.get(cell) for column in columns])) for cell in cells)
+
+    def lowerBound(self, pos1, pos2):
+        """
+        Returns a lower bound on the maze distance between two open cells.
+        """
+        best = 0
+        for d1, d2 in zip(self.distances[pos1], self.distances[pos2]):
+            if d1 is None or d2 is None: continue
+            if d1 - d2 > best: best = d1 - d2
+            elif d2 - d1 > best: best = d2 - d1
+        return best
+
+def getLandmarkTable(walls, numLandmarks=NUM_LANDMARKS):
+    """
+    Returns the LandmarkTable of a maze, building it on first use.  Tables
+    are shared by all problems on mazes with the same walls.
+    """
+    key = (walls.width, walls.height, hash(walls), numLandmarks)
+    return util.cachedForWalls(landmarkMap, key, walls, lambda: LandmarkTable(walls, numLandmarks))
+
+def farthestCell(walls, cells, nearest):
+    """
+    Returns the cell farthest from all landmarks chosen so far.  Parts of
+    the maze no landmark reaches come first, so every part of a
+    disconnected maze gets a landmark; there the cell farthest from some
+    unreached cell is chosen.
+    """
+    unreached = [cell for cell in cells if nearest[cell] is None]
+    if unreached:
+        column = distancesFrom(walls, unreached[0])
+        return max(column, key=column.get)
+    return max(cells, key=nearest.get)
+
+def distancesFrom(walls, source):
+    "Returns a dictionary mapping every cell reachable from source to its maze distance"
+    distances = {source: 0}
+    fringe = deque([source])
+    while fringe:
+        x, y = cell = fringe.popleft()
+        d = distances[cell] + 1
+        for next in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if next not in distances and not walls[next[0]][next[1]]:
+                distances[next] = d
+                fringe.append(next)
+    return distances
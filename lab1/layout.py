@@ -12,6 +12,7 @@
 # Pieter Abbeel (pabbeel@cs.berkeley.edu).
 
 
+import util
 from util import manhattanDistance
 from game import Grid
 import os
@@ -128,6 +129,107 @@ class Layout:
         elif layoutChar in  ['1', '2', '3', '4']:
             self.agentPositions.append( (int(layoutChar), (x,y)))
             self.numGhosts += 1
+
+    def getCorridorGraph(self):
+        "Returns the CorridorGraph of the maze (see getCorridorGraph below)"
+        return getCorridorGraph(self.walls)
+
+    def getClusterGraph(self, clusterSize=None):
+        "Returns the HPA* abstraction of the maze (see hierarchy.py)"
+        import hierarchy
+        if clusterSize is None: clusterSize = hierarchy.CLUSTER_SIZE
+        return hierarchy.getClusterGraph(self.walls, clusterSize)
+
+# Maps (width, height, hash of the walls) to the walls and CorridorGraph of a
+# maze (see util.cachedForWalls)
+CORRIDOR_GRAPH_CACHE = {}
+
+class CorridorGraph:
+    """
+    A maze with its corridors contracted into macro-edges.
+
+    Open cells with exactly two open neighbours are corridor cells; every
+    other open cell (junctions and dead ends) is a node.  edges[node] lists
+    the macro-edges leaving a node as (end, actions, cells) triples: taking
+    the Directions in actions from node walks down a corridor through the
+    cells in cells (end included) and stops at the next node, end.  The
+    corridors are walked once per maze, so a search over the nodes skips
+    every corridor cell.
+    """
+
+    def __init__(self, walls):
+        from game import Directions, Actions
+        self.neighbours = {}
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if walls[x][y]: continue
+                moves = []
+                for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+                    dx, dy = Actions.directionToVector(action)
+                    next = (int(x + dx), int(y + dy))
+                    if not walls[next[0]][next[1]]:
+                        moves.append((next, action))
+                self.neighbours[(x, y)] = tuple(moves)
+
+        self.nodes = set([cell for cell, moves in self.neighbours.items() if len(moves) != 2])
+        # Maps every corridor cell to the nodes at the two ends of its corridor
+        self.corridors = {}
+        self.edges = {}
+        for node in self.nodes:
+            self.edges[node] = self.edgesFrom(node)
+        # A corridor closed into a loop has no node on it; make one of its
+        # cells a node
+        for cell in self.neighbours:
+            if cell not in self.nodes and cell not in self.corridors:
+                self.nodes.add(cell)
+                self.edges[cell] = self.edgesFrom(cell)
+
+    def edgesFrom(self, node):
+        "Walks every corridor leaving node and returns its macro-edges"
+        edges = []
+        for next, action in self.neighbours[node]:
+            previous, cell = node, next
+            actions, cells = [action], [cell]
+            while cell not in self.nodes:
+                for after, action in self.neighbours[cell]:
+                    if after != previous: break
+                previous, cell = cell, after
+                actions.append(action)
+                cells.append(cell)
+            for corridorCell in cells[:-1]:
+                self.corridors[corridorCell] = (node, cell)
+            edges.append((cell, tuple(actions), tuple(cells)))
+        return edges
+
+    def withKeyCells(self, cells):
+        """
+        Returns a graph in which the given cells (e.g. the start and goal of
+        a search) are nodes as well.  Only the corridors through them are
+        walked again; the graph itself is left untouched.
+        """
+        extra = [cell for cell in cells if cell in self.neighbours and cell not in self.nodes]
+        if not extra:
+            return self
+        import copy
+        graph = copy.copy(self)
+        graph.nodes = self.nodes | set(extra)
+        graph.corridors = dict(self.corridors)
+        graph.edges = dict(self.edges)
+        affected = set(extra)
+        for cell in extra:
+            affected.update(self.corridors[cell])
+        for node in affected:
+            graph.edges[node] = graph.edgesFrom(node)
+        return graph
+
+def getCorridorGraph(walls):
+    """
+    Returns the CorridorGraph of a maze, building it on first use.  Graphs
+    are shared by all layouts and problems with the same walls.
+    """
+    key = (walls.width, walls.height, hash(walls))
+    return util.cachedForWalls(CORRIDOR_GRAPH_CACHE, key, walls, lambda: CorridorGraph(walls))
+
 def getLayout(name, back = 2):
     if name.endswith('.lay'):
         layout = tryToLoad('layouts/' + name)
@@ -0,0 +1,212 @@
+# patterndb.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Disjoint additive pattern databases for sliding tile puzzles.
+
+A pattern is a subset of the tiles.  Its database holds, for every way of
+placing those tiles and the blank on the board, the fewest moves of pattern
+tiles needed to bring them to their goal cells, with the other tiles
+treated as indistinguishable and moving them free.  The table is filled by
+a breadth first search backwards from the goal and indexed by the rank of
+the placement, so it takes one byte per placement:
+size*size * (size*size - 1) * ... entries for a pattern of k tiles, with
+k + 1 factors for the tiles and the blank.
+
+Every move shifts a single tile, which changes the cost of its own pattern
+by at most one and leaves the others alone, so when the patterns share no
+tiles the sum of their databases is a consistent heuristic.  (Keeping the
+blank matters: the cheapest cost over all blank cells would make a smaller
+table, but not a consistent heuristic.)
+
+Tables are persisted to CACHE_DIR and memory mapped on later runs, so only
+the first run on a partition pays for the search: under a second for the
+eight puzzle, and one or two minutes per database for the fifteen puzzle.
+
+Cells are numbered row by row (row * size + col) and the goal has the blank
+in cell 0 and every tile t in cell t.
+
+Example:
+databases = getPatternDatabases(3)
+sum([db.lookup(positions) for db in databases])   (positions[t] is the cell of tile t)
+"""
+
+import array
+import mmap
+import os
+from collections import deque
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.patterns')
+
+# The default partition of the tiles for each board size
+PARTITIONS = {3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+              4: ((1, 2, 3, 5, 6), (4, 8, 9, 12, 13), (7, 10, 11, 14, 15))}
+
+# Marks table entries the search has not reached yet
+UNKNOWN = 255
+
+# Maps (size, pattern) to PatternDatabases
+databaseMap = {}
+
+class PatternDatabase:
+    """
+    The database of one pattern on a size x size board.  table[rank] is the
+    cost of the placement with that rank (see rankPattern), the cells of
+    the pattern tiles followed by the cell of the blank; it is either an
+    array of unsigned bytes or a read only memory map of the cached file.
+    """
+
+    def __init__(self, size, pattern, cacheDir=CACHE_DIR):
+        self.size = size
+        self.pattern = tuple(pattern)
+        self.numEntries = numPlacements(size * size, len(self.pattern) + 1)
+        self.mapped = False
+        path = _cachePath(cacheDir, size, self.pattern)
+        self.table = readTable(path, self.numEntries)
+        if self.table is None:
+            table = buildTable(size, self.pattern)
+            writeTable(path, table)
+            self.table = readTable(path, self.numEntries) or table
+        self.mapped = isinstance(self.table, mmap.mmap)
+
+    def lookup(self, positions):
+        """
+        Returns the cost of the pattern, given the cell of every tile
+        (positions[t] is the cell of tile t, and positions[0] the blank's).
+        """
+        cells = [positions[tile] for tile in self.pattern]
+        cells.append(positions[0])
+        rank = rankPattern(cells, self.size * self.size)
+        value = self.table[rank]
+        if self.mapped: return ord(value)
+        return value
+
+def getPatternDatabases(size, partition=None, cacheDir=CACHE_DIR):
+    """
+    Returns the databases of the patterns of a partition (PARTITIONS[size]
+    by default), building or loading each on first use.
+    """
+    if partition is None: partition = PARTITIONS[size]
+    databases = []
+    for pattern in partition:
+        key = (size, tuple(pattern))
+        if key not in databaseMap:
+            databaseMap[key] = PatternDatabase(size, pattern, cacheDir)
+        databases.append(databaseMap[key])
+    return databases
+
+def numPlacements(numCells, numTiles):
+    "The number of ways to put numTiles distinct tiles on numCells cells"
+    count = 1
+    for i in range(numTiles):
+        count *= numCells - i
+    return count
+
+def rankPattern(cells, numCells):
+    """
+    Returns a perfect hash of distinct cells: their index in the
+    lexicographic order of all sequences of len(cells) distinct cells,
+    from 0 to numPlacements(numCells, len(cells)) - 1.  Each cell is
+    counted among the cells not used before it, in mixed radix.
+    """
+    rank, used = 0, 0
+    for i, cell in enumerate(cells):
+        smaller = cell - bin(used & ((1 << cell) - 1)).count('1')
+        rank = rank * (numCells - i) + smaller
+        used |= 1 << cell
+    return rank
+
+def unrankPattern(rank, numCells, numTiles):
+    "Returns the list of numTiles distinct cells that rankPattern maps to rank"
+    digits = []
+    for i in reversed(range(numTiles)):
+        rank, smaller = divmod(rank, numCells - i)
+        digits.append(smaller)
+    digits.reverse()
+    free = range(numCells)
+    return [free.pop(smaller) for smaller in digits]
+
+def neighbourCells(size):
+    "Returns the cells next to each cell of a size x size board"
+    neighbours = []
+    for cell in range(size * size):
+        row, col = divmod(cell, size)
+        adjacent = []
+        if row > 0: adjacent.append(cell - size)
+        if row < size - 1: adjacent.append(cell + size)
+        if col > 0: adjacent.append(cell - 1)
+        if col < size - 1: adjacent.append(cell + 1)
+        neighbours.append(adjacent)
+    return neighbours
+
+def buildTable(size, pattern):
+    """
+    Searches backwards from the goal over the placements of the pattern
+    tiles and the blank.  Moving a pattern tile costs 1 and moving any
+    other tile costs nothing, so it is a breadth first search that puts
+    free moves at the front of the queue.  Placements are tuples of cells,
+    the blank last.
+    """
+    numCells = size * size
+    neighbours = neighbourCells(size)
+    table = array.array('B', [UNKNOWN]) * numPlacements(numCells, len(pattern) + 1)
+
+    goal = tuple(pattern) + (0,)
+    table[rankPattern(goal, numCells)] = 0
+    fringe = deque([(goal, 0)])
+    while fringe:
+        cells, cost = fringe.popleft()
+        if table[rankPattern(cells, numCells)] < cost: continue
+        blank = cells[-1]
+        for next in neighbours[blank]:
+            if next in cells:
+                # The pattern tile on next slides into the blank
+                i = cells.index(next)
+                nextCells = cells[:i] + (blank,) + cells[i + 1:-1] + (next,)
+                nextCost = cost + 1
+            else:
+                nextCells = cells[:-1] + (next,)
+                nextCost = cost
+            rank = rankPattern(nextCells, numCells)
+            if nextCost < table[rank]:
+                table[rank] = nextCost
+                if nextCost == cost: fringe.appendleft((nextCells, nextCost))
+                else: fringe.append((nextCells, nextCost))
+    return table
+
+def _cachePath(cacheDir, size, pattern):
+    return os.path.join(cacheDir, '%dx%d-%s.pdb' % (size, size, '-'.join([str(tile) for tile in pattern])))
+
+def readTable(path, numEntries):
+    "Memory maps a cached table, or returns None if there is no usable one"
+    if not os.path.exists(path) or os.path.getsize(path) != numEntries: return None
+    try:
+        f = open(path, 'rb')
+        try: return mmap.mmap(f.fileno(), numEntries, access=mmap.ACCESS_READ)
+        finally: f.close()
+    except (IOError, OSError, mmap.error):
+        return None
+
+def writeTable(path, table):
+    "Stores a table on disk.  The cache is best effort, so failures are ignored."
+    tmpPath = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        cacheDir = os.path.dirname(path)
+        if not os.path.isdir(cacheDir): os.makedirs(cacheDir)
+        f = open(tmpPath, 'wb')
+        try: table.tofile(f)
+        finally: f.close()
+        os.rename(tmpPath, path)
+    except (IOError, OSError):
+        if os.path.exists(tmpPath): os.remove(tmpPath)
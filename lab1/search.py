@@ -18,7 +18,6 @@ Pacman agents (in searchAgents.py).
 """
 
 import util
-import copy
 
 class SearchNode:
     """
@@ -63,12 +62,9 @@ class SearchNode:
         final node to the initial.
         """
         moves = []
-        # make a deep copy to stop any referencing isues.
-        node = copy.deepcopy(self)
-
-        if node.isRootNode(): 
-            # The initial state is the final state
-            return moves        
+        # Walking the parent links never modifies them, so there is no need
+        # to copy the node (and with it the whole parent chain) first.
+        node = self
 
         "**YOUR CODE HERE**"
         while not node.isRootNode():
@@ -79,6 +75,51 @@ class SearchNode:
         return moves
 
 
+class NodeStore:
+    """
+    A compact store for the nodes generated by a search.
+
+    Instead of allocating one SearchNode object per generated successor, the
+    store keeps the node fields in parallel lists and hands out integer node
+    ids.  The frontiers of the search functions below hold these ids and the
+    parent of a node is just the id of another node, so reconstructing a path
+    is a plain walk over the lists with no copying involved.
+    """
+
+    ROOT = -1
+
+    def __init__(self):
+        self.states = []
+        self.parents = []
+        self.actions = []
+        self.costs = []
+
+    def add(self, state, parent=ROOT, action=None, cost=0):
+        """
+        Stores a new node and returns its id.
+        """
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(action)
+        self.costs.append(cost)
+        return len(self.states) - 1
+
+    def __len__(self):
+        return len(self.states)
+
+    def backtrack(self, node):
+        """
+        Returns the list of actions leading from the root to the given node.
+        """
+        moves = []
+        parents, actions = self.parents, self.actions
+        while parents[node] != NodeStore.ROOT:
+            moves.append(actions[node])
+            node = parents[node]
+        moves.reverse()
+        return moves
+
+
 class SearchProblem:
     """
     This class outlines the structure of a search problem, but doesn't implement
@@ -112,6 +153,36 @@ class SearchProblem:
         """
         util.raiseNotDefined()
 
+    def iterSuccessors(self, state):
+        """
+          state: Search state
+
+        Yields the same triples as getSuccessors, one at a time.  Problems
+        whose successors are costly to build can override this with a
+        generator, so that a search that stops early (see graphSearch) never
+        builds the rest.
+        """
+        return iter(self.getSuccessors(state))
+
+    def getGoalState(self):
+        """
+        Returns the single goal state of the problem, or None if the goal
+        is not one known state (the default).  Problems that return a goal
+        must also implement getPredecessors (see bidirectionalSearch).
+        """
+        return None
+
+    def getPredecessors(self, state):
+        """
+          state: Search state
+
+        Returns (or yields) triples (predecessor, action, stepCost) where
+        'action' leads from 'predecessor' to the given state at a cost of
+        'stepCost'.  Only needed by searches that run backwards from the
+        goal.
+        """
+        util.raiseNotDefined()
+
     def getCostOfActions(self, actions):
         """
          actions: A list of actions to take
@@ -121,6 +192,166 @@ class SearchProblem:
         """
         util.raiseNotDefined()
 
+def successorFunction(problem):
+    """
+    Returns the function searches expand states with.  iterSuccessors is
+    preferred, but only when the class that defines the problem's
+    getSuccessors defines iterSuccessors too, so a subclass that overrides
+    just getSuccessors is never bypassed by an inherited iterSuccessors.
+    """
+    if 'getSuccessors' in getattr(problem, '__dict__', {}):
+        return problem.getSuccessors
+    import inspect
+    for cls in inspect.getmro(problem.__class__):
+        if 'getSuccessors' in cls.__dict__:
+            if 'iterSuccessors' in cls.__dict__: return problem.iterSuccessors
+            break
+    return problem.getSuccessors
+
+
+# Where SearchMetrics records go ('-' for stdout); None disables metrics
+METRICS_OUTPUT = None
+# Extra fields (e.g. the layout name) added to every metrics record
+METRICS_CONTEXT = {}
+
+def enableMetrics(output, **context):
+    """
+    Makes every search function below append one JSON line of statistics
+    per run to the file named output ('-' writes to stdout).  output may
+    also be a function, which is then called with each record instead.
+    Any keyword arguments are copied into each record.  enableMetrics(None)
+    turns metrics off again.
+    """
+    global METRICS_OUTPUT, METRICS_CONTEXT
+    METRICS_OUTPUT = output
+    METRICS_CONTEXT = dict(context)
+
+class SearchMetrics:
+    """
+    Collects statistics about a single run of a search function:
+
+      expanded/generated:     calls to getSuccessors and successors returned
+      maxFrontier/maxClosed:  peak sizes of the frontier and the closed set
+      successorTime/heuristicTime: seconds spent in the problem's
+                              successor function and in the heuristic
+      expansionsPerSecond:    throughput over the whole run
+      peakMemoryKB:           peak resident size of the process, where the
+                              platform reports it
+      <name>Hits/<name>Misses: lookups in every util.LRUCache the heuristic
+                              keeps in problem.heuristicInfo under name
+
+    Search functions call SearchMetrics.start, which returns None unless
+    metrics are enabled, so the collector costs nothing when it is off.
+    """
+
+    def start(algorithm, problem, heuristic=None):
+        if METRICS_OUTPUT is None: return None
+        return SearchMetrics(algorithm, problem, heuristic)
+    start = staticmethod(start)
+
+    def __init__(self, algorithm, problem, heuristic=None):
+        import time
+        self.clock = time.time
+        self.record = dict(METRICS_CONTEXT)
+        self.record['algorithm'] = algorithm
+        self.heuristic = heuristic
+        self.heuristicInfo = getattr(problem, 'heuristicInfo', None)
+        self.record['problem'] = problem.__class__.__name__
+        if heuristic is not None:
+            self.record['heuristic'] = getattr(heuristic, '__name__', str(heuristic))
+        self.expanded = self.generated = 0
+        self.maxFrontier = self.maxClosed = 0
+        self.successorTime = self.heuristicTime = 0.0
+        self.startTime = self.clock()
+
+    def wrapSuccessors(self, getSuccessors):
+        "Returns a version of getSuccessors that is counted and timed"
+        def timedSuccessors(state):
+            start = self.clock()
+            successors = getSuccessors(state)
+            self.successorTime += self.clock() - start
+            self.expanded += 1
+            self.generated += len(successors)
+            return successors
+        return timedSuccessors
+
+    def wrapIterSuccessors(self, iterSuccessors):
+        "Returns a version of iterSuccessors that is counted and timed as it is consumed"
+        def timedIterSuccessors(state):
+            clock = self.clock
+            self.expanded += 1
+            start = clock()
+            for successor in iterSuccessors(state):
+                self.successorTime += clock() - start
+                self.generated += 1
+                yield successor
+                start = clock()
+            self.successorTime += clock() - start
+        return timedIterSuccessors
+
+    def wrapHeuristic(self, heuristic):
+        "Returns a version of heuristic that is timed"
+        def timedHeuristic(state, problem=None):
+            start = self.clock()
+            value = heuristic(state, problem)
+            self.heuristicTime += self.clock() - start
+            return value
+        return timedHeuristic
+
+    def observe(self, frontierSize, closedSize):
+        if frontierSize > self.maxFrontier: self.maxFrontier = frontierSize
+        if closedSize > self.maxClosed: self.maxClosed = closedSize
+
+    def finish(metrics, solution):
+        """
+        Completes the record of a run (metrics may be None) and writes it
+        out.  Returns the solution so searches can return through it.
+        """
+        if metrics is None: return solution
+        totalTime = metrics.clock() - metrics.startTime
+        record = metrics.record
+        record.update({'expanded': metrics.expanded, 'generated': metrics.generated,
+                       'maxFrontier': metrics.maxFrontier, 'maxClosed': metrics.maxClosed,
+                       'successorTime': metrics.successorTime, 'heuristicTime': metrics.heuristicTime,
+                       'totalTime': totalTime, 'peakMemoryKB': peakMemoryKB(),
+                       'expansionsPerSecond': metrics.expanded / totalTime if totalTime > 0 else None,
+                       'solutionLength': len(solution) if solution is not None else None})
+        cache = getattr(metrics.heuristic, 'cache', None)
+        if cache is not None:
+            record['heuristicCacheHits'] = cache.hits
+            record['heuristicCacheMisses'] = cache.misses
+        # Caches a heuristic keeps for itself, e.g. foodHeuristic's mstCache
+        for name, value in (metrics.heuristicInfo or {}).items():
+            if isinstance(value, util.LRUCache):
+                record[name + 'Hits'] = value.hits
+                record[name + 'Misses'] = value.misses
+        writeMetrics(record)
+        return solution
+    finish = staticmethod(finish)
+
+def peakMemoryKB():
+    "Returns the peak resident set size of the process in KB, or None if unknown"
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin': peak /= 1024 # reported in bytes
+    return peak
+
+def writeMetrics(record):
+    if callable(METRICS_OUTPUT):
+        METRICS_OUTPUT(record)
+        return
+    import json, sys
+    line = json.dumps(record, sort_keys=True) + '\n'
+    if METRICS_OUTPUT == '-':
+        sys.stdout.write(line)
+        return
+    f = open(METRICS_OUTPUT, 'a')
+    try: f.write(line)
+    finally: f.close()
 
 def tinyMazeSearch(problem):
     """
@@ -132,10 +363,155 @@ def tinyMazeSearch(problem):
     w = Directions.WEST
     return  [s, s, w, s, w, w, s, w]
 
-def expand(problem, currentNode):
-    """Expand successors of current node."""
-    return [SearchNode(succ[0], currentNode, succ[1], currentNode.cost+succ[2], 0) for succ in problem.getSuccessors(currentNode.position)]
+class LifoFrontier:
+    "Expands the most recently generated node first (depth first)"
 
+    def __init__(self):
+        self.stack = util.Stack()
+
+    def push(self, nodes, state, parent, action, cost):
+        self.stack.push(nodes.add(state, parent, action, cost))
+
+    def pop(self):
+        return self.stack.pop()
+
+    def isEmpty(self):
+        return self.stack.isEmpty()
+
+    def __len__(self):
+        return len(self.stack)
+
+class FifoFrontier:
+    "Expands the oldest generated node first (breadth first)"
+
+    def __init__(self):
+        self.queue = util.Queue()
+
+    def push(self, nodes, state, parent, action, cost):
+        self.queue.push(nodes.add(state, parent, action, cost))
+
+    def pop(self):
+        return self.queue.pop()
+
+    def isEmpty(self):
+        return self.queue.isEmpty()
+
+    def __len__(self):
+        return len(self.queue)
+
+class CostFrontier:
+    """
+    Expands the node with the cheapest path first (uniform cost).  A state
+    may be queued several times; the engine skips the copies that are
+    popped after the state was closed.
+    """
+
+    def __init__(self):
+        self.heap = util.PriorityQueue()
+
+    def push(self, nodes, state, parent, action, cost):
+        self.heap.push(nodes.add(state, parent, action, cost), cost)
+
+    def pop(self):
+        return self.heap.pop()
+
+    def isEmpty(self):
+        return self.heap.isEmpty()
+
+    def __len__(self):
+        return len(self.heap)
+
+class FCostFrontier:
+    """
+    Expands the node with the lowest path cost plus heuristic first (A*).
+
+    The frontier holds each state at most once: openNode maps it to the
+    node of the cheapest path found so far and gScore to that path's cost.
+    A new path to a queued state only allocates a node when it is strictly
+    cheaper, and then lowers the state's priority in place.
+    """
+
+    def __init__(self, heuristic, problem):
+        self.heuristic = heuristic
+        self.problem = problem
+        self.heap = util.IndexedPriorityQueue()
+        self.openNode = {}
+        self.gScore = {}
+
+    def push(self, nodes, state, parent, action, cost):
+        if state in self.openNode:
+            if cost >= self.gScore[state]:
+                return
+            self.heap.decreaseKey(state, cost + self.heuristic(state, self.problem))
+        else:
+            self.heap.push(state, cost + self.heuristic(state, self.problem))
+        self.gScore[state] = cost
+        self.openNode[state] = nodes.add(state, parent, action, cost)
+
+    def pop(self):
+        return self.openNode.pop(self.heap.pop())
+
+    def isEmpty(self):
+        return self.heap.isEmpty()
+
+    def __len__(self):
+        return len(self.heap)
+
+def graphSearch(problem, frontier, treeSearch=False, earlyGoalTest=False, algorithm='graphSearch'):
+    """
+    The search engine behind the functions below.
+
+    frontier is one of the frontier policies above and decides which node
+    is expanded next; its push method is offered every generated successor
+    and allocates a node for the ones it keeps.  Graph search (the default)
+    closes each state when it is first expanded and never generates it
+    again; with treeSearch=True nothing is closed.
+
+    Successors are consumed lazily through the problem's iterSuccessors
+    when it has a matching one (see successorFunction), otherwise they
+    come from getSuccessors.  Goals are normally
+    recognised when a node is expanded, so uniform cost and A* paths are
+    optimal.  With earlyGoalTest=True successors are goal tested as they
+    are generated and the search stops at the first goal, without building
+    the remaining successors.  That is only admissible when the frontier
+    expands states in order of path cost and every step costs the same,
+    i.e. for breadth first search on unit-cost problems.
+    """
+    metrics = SearchMetrics.start(algorithm, problem, getattr(frontier, 'heuristic', None))
+    iterSuccessors = successorFunction(problem)
+    if metrics is not None:
+        iterSuccessors = metrics.wrapIterSuccessors(iterSuccessors)
+        if hasattr(frontier, 'heuristic'):
+            frontier.heuristic = metrics.wrapHeuristic(frontier.heuristic)
+
+    nodes = NodeStore()
+    startState = problem.getStartState()
+    if problem.isGoalState(startState):
+        return SearchMetrics.finish(metrics, [])
+
+    frontier.push(nodes, startState, NodeStore.ROOT, None, 0)
+    closed = {}
+
+    while not frontier.isEmpty():
+        currentNode = frontier.pop()
+        position = nodes.states[currentNode]
+        if position in closed:
+            continue
+        if problem.isGoalState(position):
+            return SearchMetrics.finish(metrics, nodes.backtrack(currentNode))
+        if not treeSearch:
+            closed[position] = True
+        if metrics is not None:
+            metrics.observe(len(frontier), len(closed))
+        cost = nodes.costs[currentNode]
+        for succ, action, stepCost in iterSuccessors(position):
+            if succ in closed:
+                continue
+            if earlyGoalTest and problem.isGoalState(succ):
+                goalNode = nodes.add(succ, currentNode, action, cost + stepCost)
+                return SearchMetrics.finish(metrics, nodes.backtrack(goalNode))
+            frontier.push(nodes, succ, currentNode, action, cost + stepCost)
+    return SearchMetrics.finish(metrics, None)
 
 def depthFirstSearch(problem):
     """
@@ -152,156 +528,913 @@ def depthFirstSearch(problem):
     print "Start's successors:", problem.getSuccessors(problem.getStartState())
     """
     "*** YOUR CODE HERE ***"
-    from util import Stack
+    return graphSearch(problem, LifoFrontier(), algorithm='depthFirstSearch')
 
-    stackOpen = Stack()
+def breadthFirstSearch(problem, earlyGoalTest=False):
+    """
+    Search the shallowest nodes in the search tree first.
 
-    rootNode = SearchNode(problem.getStartState(), None, None, 0, 0)
+    With earlyGoalTest=True the search stops as soon as a goal is generated
+    rather than expanded; the path is still a shortest one if every step
+    costs the same.
+    """
+    "*** YOUR CODE HERE ***"
+    return graphSearch(problem, FifoFrontier(), earlyGoalTest=earlyGoalTest, algorithm='breadthFirstSearch')
 
-    if problem.isGoalState(rootNode.position):
-        return []
+def uniformCostSearch(problem):
+    """Search the node of least total cost first."""
+    "*** YOUR CODE HERE ***"
+    return graphSearch(problem, CostFrontier(), algorithm='uniformCostSearch')
 
-    stackOpen.push(rootNode)
-    visited = {}
+def unitCost(state):
+    "The cost function of problems in which every step costs 1"
+    return 1
 
-    while not stackOpen.isEmpty():
-        currentNode = stackOpen.pop()
-        if currentNode.position in visited:
-            continue
-        if problem.isGoalState(currentNode.position):
-            return currentNode.backtrack()
-        visited[currentNode.position] = True
-        for succ in expand(problem, currentNode):
-            if succ.position not in visited:
-                temp = SearchNode(succ.position, currentNode, succ.transition, succ.cost, 0)
-                stackOpen.push(temp)
+def nullHeuristic(state, problem=None):
+    """
+    A heuristic function estimates the cost from the current state to the nearest
+    goal in the provided SearchProblem.  This heuristic is trivial.
+    """
+    return 0
+
+# The number of heuristic values memoized by searches that cache them
+# (idaStarSearch, and aStarSearch when asked to)
+HEURISTIC_CACHE_SIZE = 100000
+
+class CachedHeuristic:
+    """
+    Memoizes a heuristic in a bounded LRU cache keyed by search state.  A*
+    evaluates the heuristic again whenever it finds a cheaper path to a
+    state that is still open; states hash in O(1) (see game.BitGrid), so a
+    lookup is much cheaper than recomputing an expensive heuristic.  The
+    cache keeps hit and miss counts.
+    """
 
+    def __init__(self, heuristic, maxSize=HEURISTIC_CACHE_SIZE):
+        self.heuristic = heuristic
+        self.cache = util.LRUCache(maxSize)
+        self.__name__ = getattr(heuristic, '__name__', str(heuristic))
 
-def breadthFirstSearch(problem):
-    """Search the shallowest nodes in the search tree first."""
+    def __call__(self, state, problem=None):
+        value = self.cache.get(state, self)
+        if value is self:
+            value = self.heuristic(state, problem)
+            self.cache.put(state, value)
+        return value
+
+def cachedHeuristic(problem, heuristic, maxSize=HEURISTIC_CACHE_SIZE):
+    """
+    Returns a CachedHeuristic for heuristic, reusing the one stored in the
+    problem's heuristicInfo when it wraps the same heuristic.
+    """
+    heuristicInfo = getattr(problem, 'heuristicInfo', None)
+    if not isinstance(heuristicInfo, dict):
+        return CachedHeuristic(heuristic, maxSize)
+    cached = heuristicInfo.get('heuristicCache')
+    if cached is None or cached.heuristic is not heuristic or cached.cache.maxSize != maxSize:
+        cached = CachedHeuristic(heuristic, maxSize)
+        heuristicInfo['heuristicCache'] = cached
+    return cached
+
+def aStarSearch(problem, heuristic=nullHeuristic, heuristicCacheSize=0):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+
+    A single search rarely evaluates the heuristic twice for one state, so
+    it is not memoized by default.  Callers that search the same problem
+    repeatedly can pass a heuristicCacheSize (e.g. HEURISTIC_CACHE_SIZE) to
+    memoize it in a CachedHeuristic holding that many values.  Problems
+    with a heuristicInfo dictionary keep it there under 'heuristicCache',
+    so later searches of the same problem with the same heuristic start
+    from a warm cache, and its hit and miss counts can be read after the
+    search.
+    """
     "*** YOUR CODE HERE ***"
-    from util import Queue
+    if heuristic is not nullHeuristic and heuristicCacheSize > 0:
+        heuristic = cachedHeuristic(problem, heuristic, heuristicCacheSize)
+    return graphSearch(problem, FCostFrontier(heuristic, problem), algorithm='aStarSearch')
+
+def isJumpPointGrid(problem):
+    """
+    True if jumpPointSearch may walk the problem's walls directly: its
+    states are cells, every action is one step to a neighbouring open cell
+    and steps cost 1.  Classes vouch for this by setting supportsJumpPoints
+    next to the getSuccessors they define (PositionSearchProblem does), so
+    a subclass that redefines getSuccessors must set it again itself.
+    """
+    if 'getSuccessors' in getattr(problem, '__dict__', {}):
+        return False
+    import inspect
+    for cls in inspect.getmro(problem.__class__):
+        if 'getSuccessors' in cls.__dict__:
+            if not cls.__dict__.get('supportsJumpPoints', False): return False
+            break
+    return getattr(problem, 'walls', None) is not None and getattr(problem, 'costFn', None) is unitCost
+
+def jumpPointSearch(problem, heuristic=nullHeuristic):
+    """
+    Jump point search: A* on a 4-connected grid with unit step costs that
+    prunes symmetric paths.  From each expanded cell the search runs in a
+    straight line and only stops at jump points, cells where an optimal
+    path may have to turn because a wall ends beside it, or at a goal.
+    Paths are as short as those of aStarSearch while far fewer cells are
+    expanded on open mazes.
+
+    Only problems that isJumpPointGrid accepts are searched this way.  Any
+    other problem, even one whose states are positions, is handed to
+    hierarchicalSearch: plain aStarSearch, plus the refinement of abstract
+    routes for problems like searchAgents.HierarchicalSearchProblem.
+
+    >>> import layout, pacman, searchAgents
+    >>> maze = layout.Layout(['%%%%%%%%%%%%', '%P   %.    %', '% %% % %%% %', '%    %  %  %',
+    ...                       '% %%%% % % %', '%         %%', '%%%%%%%%%%%%'])
+    >>> state = pacman.GameState(); state.initialize(maze, 0)
+    >>> problem = searchAgents.PositionSearchProblem(state, goal=(6, 5), warn=False, visualize=False)
+    >>> isJumpPointGrid(problem), len(jumpPointSearch(problem)) == len(breadthFirstSearch(problem))
+    (True, True)
+    >>> corridors = searchAgents.CorridorSearchProblem(problem)
+    >>> isJumpPointGrid(corridors), jumpPointSearch(corridors) == aStarSearch(corridors)
+    (False, True)
+    >>> hierarchy = searchAgents.HierarchicalSearchProblem(state, goal=(6, 5), warn=False, visualize=False)
+    >>> route = jumpPointSearch(hierarchy)
+    >>> isJumpPointGrid(hierarchy), route == hierarchicalSearch(hierarchy), hierarchy.getCostOfActions(route)
+    (False, True, 13)
+    """
+    if not isJumpPointGrid(problem):
+        return hierarchicalSearch(problem, heuristic)
+    walls = problem.walls
+
+    from game import Actions
+    from util import IndexedPriorityQueue
 
-    queueOpen = Queue()
+    metrics = SearchMetrics.start('jumpPointSearch', problem, heuristic)
+    getSuccessors = problem.getSuccessors
+    if metrics is not None:
+        getSuccessors = metrics.wrapSuccessors(getSuccessors)
+        heuristic = metrics.wrapHeuristic(heuristic)
 
-    rootNode = SearchNode(problem.getStartState(), None, None, 0, 0)
+    def jump(x, y, dx, dy):
+        """
+        Walks from (x, y) in direction (dx, dy) and returns the first jump
+        point, or None if the walk runs into a wall first.
+        """
+        while True:
+            x, y = x + dx, y + dy
+            if walls[x][y]:
+                return None
+            if problem.isGoalState((x, y)):
+                return (x, y)
+            if dx != 0:
+                # A cell above or below that was walled off one step back
+                if (not walls[x][y + 1] and walls[x - dx][y + 1]) or \
+                   (not walls[x][y - 1] and walls[x - dx][y - 1]):
+                    return (x, y)
+            else:
+                if (not walls[x + 1][y] and walls[x + 1][y - dy]) or \
+                   (not walls[x - 1][y] and walls[x - 1][y - dy]):
+                    return (x, y)
+                # Vertical runs stop wherever a horizontal run would
+                if jump(x, y, 1, 0) is not None or jump(x, y, -1, 0) is not None:
+                    return (x, y)
 
-    if problem.isGoalState(rootNode.position):
-        return []
+    # Each node stores the straight segment leading to it as (action, length)
+    queueOpen = IndexedPriorityQueue()
+    nodes = NodeStore()
+    openNode = {}
+    gScore = {}
+    closed = {}
+    heading = {}
 
-    queueOpen.push(rootNode)
-    visited = {}
-    #visited;
-    #cvorovi = [pocetni];
+    startState = problem.getStartState()
+    if problem.isGoalState(startState):
+        return SearchMetrics.finish(metrics, [])
+
+    openNode[startState] = nodes.add(startState)
+    gScore[startState] = 0
+    heading[startState] = None
+    queueOpen.push(startState, 0)
 
     while not queueOpen.isEmpty():
-        #ako je cvor u visited -> continue
-        #stavi cvor u visited
-        #za svakog sljedbenika: ako nije u visited, dodaj ga u cvorove
-        currentNode = queueOpen.pop()
-        if currentNode.position in visited:
-            continue
-        if problem.isGoalState(currentNode.position):
-            return currentNode.backtrack()
-        visited[currentNode.position] = True
-        for succ in expand(problem, currentNode):
-            if succ.position not in visited:
-                temp = SearchNode(succ.position, currentNode, succ.transition, succ.cost, 0)
-                queueOpen.push(temp)
+        position = queueOpen.pop()
+        currentNode = openNode.pop(position)
+        if problem.isGoalState(position):
+            segments = nodes.backtrack(currentNode)
+            return SearchMetrics.finish(metrics, [action for action, length in segments for i in range(length)])
+        closed[position] = True
+        if metrics is not None:
+            metrics.observe(len(queueOpen), len(closed))
+        cost = gScore[position]
+        x, y = position
+        for succ, action, stepCost in getSuccessors(position):
+            dx, dy = Actions.directionToVector(action)
+            dx, dy = int(dx), int(dy)
+            # Never turn back the way the segment came
+            if heading[position] is not None:
+                hx, hy = heading[position]
+                if (dx, dy) == (-hx, -hy):
+                    continue
+            jumpPoint = jump(x, y, dx, dy)
+            if jumpPoint is None or jumpPoint in closed:
+                continue
+            length = abs(jumpPoint[0] - x) + abs(jumpPoint[1] - y)
+            succCost = cost + length
+            if jumpPoint in openNode:
+                if succCost >= gScore[jumpPoint]:
+                    continue
+                queueOpen.decreaseKey(jumpPoint, succCost + heuristic(jumpPoint, problem))
+            else:
+                queueOpen.push(jumpPoint, succCost + heuristic(jumpPoint, problem))
+            gScore[jumpPoint] = succCost
+            heading[jumpPoint] = (dx, dy)
+            openNode[jumpPoint] = nodes.add(jumpPoint, currentNode, (action, length), succCost)
+    return SearchMetrics.finish(metrics, None)
 
+def bidirectionalSearch(problem):
+    """
+    Bidirectional uniform cost search for problems with a single goal
+    state.  One search runs forward from the start through the successors
+    and another backwards from the goal through the predecessors, always
+    advancing the one with the smaller frontier.  Whenever a generated
+    state is known to the other search the two halves form a path, and the
+    search stops once the two frontiers cannot produce a cheaper one.  On
+    unit-cost mazes this is a breadth first search from both ends, which
+    expands roughly the states within half the distance of either end
+    instead of all those within the full distance of the start.
 
-def uniformCostSearch(problem):
-    """Search the node of least total cost first."""
-    "*** YOUR CODE HERE ***"
-    
-    from util import PriorityQueue
+    The problem must name its goal through getGoalState and implement
+    getPredecessors (PositionSearchProblem does); other problems are
+    solved with uniformCostSearch.
+    """
+    getGoalState = getattr(problem, 'getGoalState', None)
+    goal = getGoalState() if getGoalState is not None else None
+    if goal is None:
+        return uniformCostSearch(problem)
 
-    queueOpen = PriorityQueue()
+    from util import IndexedPriorityQueue
 
-    rootNode = SearchNode(problem.getStartState(), None, None, 0, 0)
+    metrics = SearchMetrics.start('bidirectionalSearch', problem)
+    expanders = [successorFunction(problem), problem.getPredecessors]
+    if metrics is not None:
+        expanders = [metrics.wrapIterSuccessors(expander) for expander in expanders]
 
-    if problem.isGoalState(rootNode.position):
-        return []
+    startState = problem.getStartState()
+    if problem.isGoalState(startState):
+        return SearchMetrics.finish(metrics, [])
 
-    queueOpen.push(rootNode, 0)
-    visited = {}
+    # Index 0 is the forward search and 1 the backward one.  parents maps
+    # a state to the neighbour it was reached from and the action between
+    # them, in the direction of travel from start to goal.
+    queues = [IndexedPriorityQueue(), IndexedPriorityQueue()]
+    gScores = [{startState: 0}, {goal: 0}]
+    parents = [{startState: None}, {goal: None}]
+    closed = [{}, {}]
+    queues[0].push(startState, 0)
+    queues[1].push(goal, 0)
 
-    while not queueOpen.isEmpty():
-        currentNode = queueOpen.pop()
-        if currentNode.position in visited:
-            continue
-        if problem.isGoalState(currentNode.position):
-            return currentNode.backtrack()
-        visited[currentNode.position] = True
-        for succ in expand(problem, currentNode):
-            if succ.position not in visited:
-                temp = SearchNode(succ.position, currentNode, succ.transition, succ.cost, 0)
-                queueOpen.push(temp, succ.cost)
+    bestCost, meeting = float('inf'), None
+    while not queues[0].isEmpty() and not queues[1].isEmpty():
+        if queues[0].topPriority() + queues[1].topPriority() >= bestCost:
+            break
+        side = 1 if len(queues[1]) < len(queues[0]) else 0
+        queue, gScore, parent, other = queues[side], gScores[side], parents[side], gScores[1 - side]
+        state = queue.pop()
+        closed[side][state] = True
+        if metrics is not None:
+            metrics.observe(len(queues[0]) + len(queues[1]), len(closed[0]) + len(closed[1]))
+        cost = gScore[state]
+        for neighbour, action, stepCost in expanders[side](state):
+            if neighbour in closed[side]:
+                continue
+            neighbourCost = cost + stepCost
+            if neighbour in gScore and neighbourCost >= gScore[neighbour]:
+                continue
+            queue.push(neighbour, neighbourCost)
+            gScore[neighbour] = neighbourCost
+            parent[neighbour] = (state, action)
+            if neighbour in other and neighbourCost + other[neighbour] < bestCost:
+                bestCost, meeting = neighbourCost + other[neighbour], neighbour
 
+    if meeting is None:
+        return SearchMetrics.finish(metrics, None)
+    forward, state = [], meeting
+    while parents[0][state] is not None:
+        state, action = parents[0][state]
+        forward.append(action)
+    forward.reverse()
+    backward, state = [], meeting
+    while parents[1][state] is not None:
+        state, action = parents[1][state]
+        backward.append(action)
+    return SearchMetrics.finish(metrics, forward + backward)
 
-def nullHeuristic(state, problem=None):
+
+def hierarchicalSearch(problem, heuristic=nullHeuristic):
     """
-    A heuristic function estimates the cost from the current state to the nearest
-    goal in the provided SearchProblem.  This heuristic is trivial.
+    Hierarchical path-finding: runs A* over an abstract problem, such as
+    searchAgents.HierarchicalSearchProblem, whose actions are moves between
+    abstract nodes, then hands the route to the problem's refineRoute to be
+    refined into primitive actions.  Problems without refineRoute are
+    simply solved with aStarSearch, and their solutions returned as is.
     """
-    return 0
+    route = aStarSearch(problem, heuristic)
+    refineRoute = getattr(problem, 'refineRoute', None)
+    if route is None or refineRoute is None:
+        return route
+    return refineRoute(route)
 
-def aStarSearch(problem, heuristic=nullHeuristic):
-    """Search the node that has the lowest combined cost and heuristic first."""
-    "*** YOUR CODE HERE ***"
-    from util import PriorityQueue
+# Heuristic weights ARA* starts from and subtracts after each solution
+ARA_INITIAL_WEIGHT = 5.0
+ARA_WEIGHT_STEP = 1.0
+# Seconds anytimeRepairingAStarSearch may run by default
+ARA_TIME_LIMIT = 10.0
+
+class AnytimeRepairingAStar:
+    """
+    Anytime repairing A* (ARA*, Likhachev, Gordon and Thrun 2003).
 
-    queueOpen = PriorityQueue()
-    openNodes = []
-    closedNodes = []
-    visited = {}
-    opened = []
+    A weighted A* with f = g + weight * h finds a first solution quickly;
+    its cost is at most weight times the optimum.  The weight is then
+    lowered step by step and the search repaired rather than restarted:
+    states whose cost improved after they were expanded are kept aside
+    (incons) and reopened along with the open set, so each pass only
+    redoes the work the lower weight invalidates.  After each pass
+    bestPath and bestCost hold the best solution so far and bound the
+    proven suboptimality bound; a bound of 1 means bestPath is optimal.
+    """
+
+    def __init__(self, problem, heuristic=nullHeuristic, weight=ARA_INITIAL_WEIGHT, weightStep=ARA_WEIGHT_STEP):
+        import time
+        self.clock = time.time
+        self.problem = problem
+        self.heuristic = heuristic
+        self.weight = max(1.0, weight)
+        self.weightStep = weightStep
+        self.metrics = SearchMetrics.start('anytimeRepairingAStarSearch', problem, heuristic)
+        self.iterSuccessors = successorFunction(problem)
+        if self.metrics is not None:
+            self.iterSuccessors = self.metrics.wrapIterSuccessors(self.iterSuccessors)
+            self.heuristic = self.metrics.wrapHeuristic(heuristic)
 
-    rootNode = SearchNode(problem.getStartState(), None, None, 0, 0)
+        self.nodes = NodeStore()
+        self.node = {}
+        self.g = {}
+        self.h = {}
+        self.open = util.IndexedPriorityQueue()
+        self.closed = {}
+        self.incons = {}
+        self.bestGoal = None
+        self.bestPath = None
+        self.bestCost = None
+        self.bound = None
 
-    if problem.isGoalState(rootNode.position):
-        return []
+        startState = problem.getStartState()
+        self.g[startState] = 0
+        self.node[startState] = self.nodes.add(startState)
+        if problem.isGoalState(startState):
+            self.bestGoal, self.bestCost = self.node[startState], 0
+        else:
+            self.open.push(startState, self.fValue(startState))
 
-    queueOpen.push(rootNode, 0)
-    openNodes.append(rootNode)
-    opened.append(rootNode.position)
+    def hValue(self, state):
+        if state not in self.h:
+            self.h[state] = self.heuristic(state, self.problem)
+        return self.h[state]
 
-    while not queueOpen.isEmpty():
-        currentNode = queueOpen.pop()
-        openNodes.remove(currentNode)
-        opened.remove(currentNode.position)
-        if currentNode.position in visited:
+    def fValue(self, state):
+        return self.g[state] + self.weight * self.hValue(state)
+
+    def improvePath(self, deadline=None):
+        """
+        Expands states until no open state can lead to a solution cheaper
+        than bestCost under the current weight.  Returns False if the
+        deadline passed first.
+        """
+        problem, nodes, g, open, closed = self.problem, self.nodes, self.g, self.open, self.closed
+        while not open.isEmpty():
+            if self.bestCost is not None and self.bestCost <= open.topPriority():
+                return True
+            if deadline is not None and self.clock() > deadline:
+                return False
+            position = open.pop()
+            closed[position] = True
+            if self.metrics is not None:
+                self.metrics.observe(len(open), len(closed))
+            cost, currentNode = g[position], self.node[position]
+            for succ, action, stepCost in self.iterSuccessors(position):
+                succCost = cost + stepCost
+                if succ in g and succCost >= g[succ]:
+                    continue
+                g[succ] = succCost
+                self.node[succ] = nodes.add(succ, currentNode, action, succCost)
+                if problem.isGoalState(succ):
+                    if self.bestCost is None or succCost < self.bestCost:
+                        self.bestGoal, self.bestCost = self.node[succ], succCost
+                elif succ in closed:
+                    self.incons[succ] = True
+                else:
+                    open.push(succ, self.fValue(succ))
+        return True
+
+    def suboptimalityBound(self):
+        "Returns how many times costlier than the optimum bestCost can be"
+        states = self.open.items() + self.incons.keys()
+        if not states: return 1.0
+        lowerBound = min([self.bestCost] + [self.g[s] + self.hValue(s) for s in states])
+        if lowerBound <= 0: return self.weight
+        return min(self.weight, float(self.bestCost) / lowerBound)
+
+    def reopen(self):
+        "Lowers the weight and moves the open and inconsistent states to a fresh open set"
+        self.weight = max(1.0, self.weight - self.weightStep)
+        states = self.open.items() + self.incons.keys()
+        self.open = util.IndexedPriorityQueue()
+        for state in states:
+            self.open.push(state, self.fValue(state))
+        self.incons = {}
+        self.closed = {}
+
+    def run(self, timeLimit=None, onSolution=None):
+        """
+        Improves the solution until it is proven optimal or timeLimit
+        seconds have passed, calling onSolution(actions, cost, bound) every
+        time a better solution is found.  Returns the best path, or None if
+        no solution was found.
+        """
+        deadline = None
+        if timeLimit is not None:
+            deadline = self.clock() + timeLimit
+        while True:
+            finished = self.improvePath(deadline)
+            if self.bestGoal is None:
+                break
+            if finished:
+                self.bound = self.suboptimalityBound()
+            path = self.nodes.backtrack(self.bestGoal)
+            if path != self.bestPath:
+                self.bestPath = path
+                if onSolution is not None:
+                    onSolution(path, self.bestCost, self.bound)
+            if not finished or self.bound <= 1 or self.weight <= 1:
+                break
+            self.reopen()
+        return SearchMetrics.finish(self.metrics, self.bestPath)
+
+def anytimeRepairingAStarSearch(problem, heuristic=nullHeuristic, timeLimit=ARA_TIME_LIMIT, onSolution=None,
+                                weight=ARA_INITIAL_WEIGHT, weightStep=ARA_WEIGHT_STEP):
+    """
+    Search with anytime repairing A* (see AnytimeRepairingAStar) for up to
+    timeLimit seconds (None for no limit) and return the best path found.
+    onSolution(actions, cost, bound) is called with every improved path, so
+    callers can hold on to the current best path while the search runs.
+    """
+    ara = AnytimeRepairingAStar(problem, heuristic, weight, weightStep)
+    return ara.run(timeLimit, onSolution)
+
+
+# The number of states idaStarSearch remembers per round by default
+IDA_TABLE_SIZE = 100000
+
+def idaStarSearch(problem, heuristic=nullHeuristic, tableSize=None):
+    """
+    Iterative deepening A*: repeated depth first searches, each cut off at
+    nodes whose f = g + h exceeds a bound, with the bound raised to the
+    smallest f that was cut off in the previous round.  Paths are optimal
+    for admissible heuristics.
+
+    Besides the current path, a round remembers the cheapest cost at which
+    it reached up to tableSize states (IDA_TABLE_SIZE by default) in an LRU
+    table and does not search below a state it already reached as cheaply.
+    Without the table, grids with many equally short paths make plain
+    IDA* exponential.  Memory use is therefore bounded by the table size
+    plus the path length, at the price of expanding states again every
+    round.  Heuristic values are memoized too (see cachedHeuristic).
+    """
+    metrics = SearchMetrics.start('idaStarSearch', problem, heuristic)
+    iterSuccessors = successorFunction(problem)
+    if heuristic is not nullHeuristic:
+        heuristic = cachedHeuristic(problem, heuristic)
+    if metrics is not None:
+        iterSuccessors = metrics.wrapIterSuccessors(iterSuccessors)
+        heuristic = metrics.wrapHeuristic(heuristic)
+
+    startState = problem.getStartState()
+    if problem.isGoalState(startState):
+        return SearchMetrics.finish(metrics, [])
+
+    if tableSize is None:
+        tableSize = IDA_TABLE_SIZE
+    bound = heuristic(startState, problem)
+    while True:
+        reached = util.LRUCache(max(1, tableSize))
+        reached.put(startState, 0)
+        # The current path: its states, the actions between them, the cost
+        # of reaching each state and the successors still to be tried
+        states, actions, costs = [startState], [], [0]
+        onPath = {startState: True}
+        pending = [iter(iterSuccessors(startState))]
+        nextBound = None
+        while pending:
+            if metrics is not None:
+                metrics.observe(len(pending), len(onPath))
+            try:
+                succ, action, stepCost = next(pending[-1])
+            except StopIteration:
+                pending.pop()
+                del onPath[states.pop()]
+                costs.pop()
+                if actions: actions.pop()
+                continue
+            if succ in onPath:
+                continue
+            cost = costs[-1] + stepCost
+            reachedCost = reached.get(succ)
+            if reachedCost is not None and reachedCost <= cost:
+                continue
+            reached.put(succ, cost)
+            f = cost + heuristic(succ, problem)
+            if f > bound:
+                if nextBound is None or f < nextBound:
+                    nextBound = f
+                continue
+            if problem.isGoalState(succ):
+                return SearchMetrics.finish(metrics, actions + [action])
+            states.append(succ)
+            actions.append(action)
+            costs.append(cost)
+            onPath[succ] = True
+            pending.append(iter(iterSuccessors(succ)))
+        if nextBound is None:
+            return SearchMetrics.finish(metrics, None)
+        bound = nextBound
+
+# The number of nodes smaStarSearch may hold in memory by default
+SMA_NODE_BUDGET = 100000
+
+class SMANode:
+    "A node of the SMA* search tree"
+
+    def __init__(self, state, parent=None, action=None, cost=0, f=0, index=None):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+        self.depth = parent is not None and parent.depth + 1 or 0
+        self.f = f
+        self.index = index      # position among the parent's successors
+        self.successors = None  # generated on the first expansion
+        self.nextSuccessor = 0  # index of the first successor never generated
+        self.forgotten = {}     # index of a dropped successor -> its backed-up f
+        self.children = []      # successors currently in memory
+        self.stamp = None       # stamp of the node's open set entries, None if closed
+
+def smaStarSearch(problem, heuristic=nullHeuristic, maxNodes=None):
+    """
+    Simplified memory-bounded A* (SMA*, Russell 1992) holding at most
+    maxNodes search nodes in memory (SMA_NODE_BUDGET by default).
+
+    Like A*, the search expands the open node with the lowest f, but it
+    generates one successor at a time.  When memory is full it drops the
+    shallowest open leaf with the highest f; the parent remembers the
+    leaf's f and regenerates it once everything else looks worse.  f values
+    are backed up from children to parents, so dropped subtrees are
+    remembered by their best f.  A successor is not generated while a copy
+    of its state that is at least as cheap is in memory.  The path returned
+    is optimal if an optimal path fits in memory (is at most maxNodes - 1
+    steps long); None is returned if no solution fits in memory.
+
+    With room for under half of the maze it still finds a shortest path:
+
+    >>> import layout, pacman, searchAgents
+    >>> maze = layout.Layout(['%%%%%%%%%%%%', '%P   %.    %', '% %% % %%% %', '%    %  %  %',
+    ...                       '% %%%% % % %', '%         %%', '%%%%%%%%%%%%'])
+    >>> state = pacman.GameState(); state.initialize(maze, 0)
+    >>> problem = searchAgents.PositionSearchProblem(state, goal=(6, 5), warn=False, visualize=False)
+    >>> path = smaStarSearch(problem, searchAgents.manhattanHeuristic, maxNodes=16)
+    >>> len(path) == len(breadthFirstSearch(problem))
+    True
+    >>> problem.getCostOfActions(path) == len(path)
+    True
+    >>> smaStarSearch(problem, searchAgents.manhattanHeuristic, maxNodes=len(path)) is None
+    True
+    """
+    import heapq
+    if maxNodes is None:
+        maxNodes = SMA_NODE_BUDGET
+    maxNodes = max(2, int(maxNodes))
+    infinity = float('inf')
+
+    metrics = SearchMetrics.start('smaStarSearch', problem, heuristic)
+    iterSuccessors = successorFunction(problem)
+    if metrics is not None:
+        iterSuccessors = metrics.wrapIterSuccessors(iterSuccessors)
+        heuristic = metrics.wrapHeuristic(heuristic)
+
+    # The open set lives in two heaps: one ordered on f (deepest first) to
+    # find the best node, one on -f (shallowest first) to find the worst.
+    # Reopening a node stamps new entries; entries with an old stamp are
+    # stale and skipped.
+    best, worst = [], []
+    stamps = [0]
+
+    def openNode(node):
+        stamps[0] += 1
+        node.stamp = stamps[0]
+        heapq.heappush(best, (node.f, -node.depth, node.stamp, node))
+        heapq.heappush(worst, (-node.f, node.depth, node.stamp, node))
+
+    def closeNode(node):
+        node.stamp = None
+
+    def bestNode():
+        while best and best[0][2] != best[0][3].stamp:
+            heapq.heappop(best)
+        return best and best[0][3] or None
+
+    def worstLeaf():
+        "Removes the shallowest open leaf with the highest f from the open set and returns it"
+        skipped = []
+        leaf = None
+        while worst:
+            entry = heapq.heappop(worst)
+            node = entry[3]
+            if entry[2] != node.stamp:
+                continue
+            if not node.children and node.parent is not None:
+                leaf = node
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(worst, entry)
+        if leaf is not None:
+            closeNode(leaf)
+            if inMemory.get(leaf.state) is leaf:
+                del inMemory[leaf.state]
+        return leaf
+
+    def backup(node):
+        "Sets the f of fully generated nodes to the best f below them, up the tree"
+        while node is not None and node.nextSuccessor == len(node.successors):
+            values = node.forgotten.values() + [child.f for child in node.children]
+            if values:
+                f = min(values)
+            else:
+                f = infinity
+            if f == node.f: break
+            node.f = f
+            if node.stamp is not None: openNode(node)
+            node = node.parent
+
+    def onPath(node, state):
+        while node is not None:
+            if node.state == state: return True
+            node = node.parent
+        return False
+
+    startState = problem.getStartState()
+    root = SMANode(startState, f=heuristic(startState, problem))
+    openNode(root)
+    # The cheapest node in memory for each state
+    inMemory = {startState: root}
+    size = 1
+
+    while True:
+        node = bestNode()
+        if node is None or node.f == infinity:
+            return SearchMetrics.finish(metrics, None)
+        if problem.isGoalState(node.state):
+            actions = []
+            while node.parent is not None:
+                actions.append(node.action)
+                node = node.parent
+            actions.reverse()
+            return SearchMetrics.finish(metrics, actions)
+
+        # Generate the next successor: a new one while any are left, then
+        # the dropped one with the best remembered f
+        if node.successors is None:
+            node.successors = [s for s in iterSuccessors(node.state) if not onPath(node, s[0])]
+        remembered = None
+        if node.nextSuccessor < len(node.successors):
+            index = node.nextSuccessor
+            node.nextSuccessor += 1
+        elif node.forgotten:
+            index = min(node.forgotten, key=node.forgotten.get)
+            remembered = node.forgotten.pop(index)
+        elif not node.children:
+            # A dead end stays open with f = infinity until it is dropped
+            node.f = infinity
+            openNode(node)
+            backup(node.parent)
+            continue
+        else:
+            # Every successor is in memory; the node is no longer a frontier node
+            closeNode(node)
+            backup(node)
             continue
-        if problem.isGoalState(currentNode.position):
-            return currentNode.backtrack()
-        visited[currentNode.position] = True
-        closedNodes.append(currentNode)
-        for succ in expand(problem, currentNode):
-            """provjera da li je u visited, provjera da li je u opened, ako je u nekom od ta dva 
-            onda preskoci dodavanje novog cvora jer vec postoji onaj s manjom vrijednosti"""
-            flag = False
-            if succ.position in visited:
-                for t in closedNodes:
-                    if t.position==succ.position:
-                        if t.cost < succ.cost:
-                            flag = True
-                            break;
-            if succ.position in opened:
-                for t in openNodes:
-                    if t.position==succ.position:
-                        if t.cost < succ.cost:
-                            flag = True
-                            break;
-            if not flag:
-                temp = SearchNode(succ.position, currentNode, succ.transition, succ.cost, 0)
-                f = succ.cost + heuristic(succ.position, problem)
-                queueOpen.push(temp, f)
-                openNodes.append(temp)
-                opened.append(temp.position)
 
+        succ, action, stepCost = node.successors[index]
+        cost = node.cost + stepCost
+        if succ in inMemory and inMemory[succ].cost <= cost:
+            continue
+        if not problem.isGoalState(succ) and node.depth + 1 >= maxNodes - 1:
+            f = infinity # no path through succ fits in memory
+        else:
+            f = max(node.f, cost + heuristic(succ, problem))
+        if remembered is not None:
+            f = max(f, remembered)
+        child = SMANode(succ, node, action, cost, f, index)
+        node.children.append(child)
+        inMemory[succ] = child
+        if node.nextSuccessor == len(node.successors) and not node.forgotten:
+            closeNode(node)
+        backup(node)
+
+        if size >= maxNodes:
+            # Forget the worst leaf, remembering its f in its parent
+            leaf = worstLeaf()
+            if leaf is not None:
+                parent = leaf.parent
+                parent.children.remove(leaf)
+                parent.forgotten[leaf.index] = leaf.f
+                if parent.stamp is None:
+                    openNode(parent)
+                size -= 1
+        openNode(child)
+        size += 1
+        if metrics is not None:
+            metrics.observe(size, 0)
+
+
+INFINITY = float('inf')
+
+class DStarLite:
+    """
+    D* Lite (Koenig and Likhachev 2002), an incremental search that keeps
+    its work between queries.
+
+    The search runs backwards from the goals, so g[state] is the cost of
+    the cheapest path from state to any goal as of the last plan and
+    rhs[state] the one-step lookahead on it.  When the start moves, a
+    goal is added or removed or the cost of some moves changes, only the
+    states whose g values no longer agree with their rhs values are put
+    back on the queue, and the next plan repairs just the region around
+    the change instead of searching from scratch.
+
+    The problem must implement getSuccessors and getPredecessors (as
+    PositionSearchProblem does).  goals defaults to the problem's goal
+    state.  distance(a, b) must be a consistent lower bound on the cost of
+    moving between two states (util.manhattanDistance on a grid); without
+    one the search is an incremental uniform cost search.
+
+    An agent calls plan for a path, and tells the planner about every
+    change before the next call:
+
+      planner = DStarLite(problem, goals=food.asList(), distance=util.manhattanDistance)
+      actions = planner.plan()
+      planner.moveStart(newPosition)
+      planner.removeGoal(eatenFood)
+      planner.updateCosts(changedStates)
+
+    Every plan of a walk that eats all the dots is as short as a breadth
+    first search from scratch to the nearest dot left:
+
+    >>> import layout, pacman, searchAgents
+    >>> maze = layout.Layout(['%%%%%%%%%%%%', '%P . %.   .%', '% %% % %%% %', '%.   .  % .%',
+    ...                       '% %%%% % % %', '%.  .    %.%', '%%%%%%%%%%%%'])
+    >>> state = pacman.GameState(); state.initialize(maze, 0)
+    >>> problem = searchAgents.PositionSearchProblem(state, warn=False, visualize=False)
+    >>> food = set(state.getFood().asList())
+    >>> planner = DStarLite(problem, goals=food, distance=util.manhattanDistance)
+    >>> position, mismatches = problem.getStartState(), 0
+    >>> for step in range(200):
+    ...     if not food: break
+    ...     actions = planner.plan()
+    ...     fresh = [breadthFirstSearch(searchAgents.PositionSearchProblem(state, goal=dot, start=position,
+    ...                                 warn=False, visualize=False)) for dot in food]
+    ...     if len(actions) != min(map(len, fresh)): mismatches += 1
+    ...     position = dict((action, succ) for succ, action, cost in problem.getSuccessors(position))[actions[0]]
+    ...     planner.moveStart(position)
+    ...     if position in food:
+    ...         food.remove(position)
+    ...         planner.removeGoal(position)
+    >>> food, mismatches
+    (set([]), 0)
+    """
+
+    def __init__(self, problem, goals=None, distance=None):
+        self.problem = problem
+        self.distance = distance
+        if goals is None:
+            goals = [problem.getGoalState()]
+        self.goals = set(goals)
+        self.start = self.last = problem.getStartState()
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.queue = util.IndexedPriorityQueue()
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self.queue.push(goal, self.key(goal))
+
+    def h(self, state):
+        if self.distance is None: return 0
+        return self.distance(self.start, state)
+
+    def key(self, state):
+        best = min(self.g.get(state, INFINITY), self.rhs.get(state, INFINITY))
+        return (best + self.h(state) + self.km, best)
+
+    def updateState(self, state):
+        "Recomputes the lookahead of a state and queues it if it is inconsistent"
+        if state in self.goals:
+            self.rhs[state] = 0
+        else:
+            best = INFINITY
+            for succ, action, stepCost in self.problem.getSuccessors(state):
+                cost = stepCost + self.g.get(succ, INFINITY)
+                if cost < best: best = cost
+            self.rhs[state] = best
+        if self.g.get(state, INFINITY) != self.rhs.get(state, INFINITY):
+            self.queue.update(state, self.key(state))
+        elif self.queue.contains(state):
+            self.queue.remove(state)
+
+    def computeShortestPath(self):
+        "Expands inconsistent states until g of the start is correct"
+        queue, g, rhs = self.queue, self.g, self.rhs
+        while not queue.isEmpty():
+            start = self.start
+            if queue.topPriority() >= self.key(start) and rhs.get(start, INFINITY) == g.get(start, INFINITY):
+                break
+            oldKey = queue.topPriority()
+            state = queue.pop()
+            newKey = self.key(state)
+            if oldKey < newKey:
+                queue.push(state, newKey)
+            elif g.get(state, INFINITY) > rhs.get(state, INFINITY):
+                g[state] = rhs[state]
+                for pred, action, stepCost in self.problem.getPredecessors(state):
+                    self.updateState(pred)
+            else:
+                g[state] = INFINITY
+                self.updateState(state)
+                for pred, action, stepCost in self.problem.getPredecessors(state):
+                    self.updateState(pred)
+
+    def plan(self):
+        """
+        Returns the actions of a cheapest path from the current start to
+        the nearest goal, or None if no goal can be reached.
+        """
+        self.computeShortestPath()
+        if self.g.get(self.start, INFINITY) == INFINITY and self.start not in self.goals:
+            return None
+        actions = []
+        state = self.start
+        while state not in self.goals:
+            best, bestAction, bestState = INFINITY, None, None
+            for succ, action, stepCost in self.problem.getSuccessors(state):
+                cost = stepCost + self.g.get(succ, INFINITY)
+                if cost < best:
+                    best, bestAction, bestState = cost, action, succ
+            if bestState is None:
+                return None
+            actions.append(bestAction)
+            state = bestState
+        return actions
+
+    def moveStart(self, state):
+        "Makes state the start of the next plan"
+        if self.distance is not None:
+            self.km += self.distance(self.last, state)
+        self.start = self.last = state
+
+    def addGoal(self, state):
+        self.goals.add(state)
+        self.updateState(state)
+
+    def removeGoal(self, state):
+        if state in self.goals:
+            self.goals.remove(state)
+            self.updateState(state)
+
+    def updateCosts(self, states):
+        """
+        Tells the planner that the costs of the moves out of the given
+        states have changed (for example because a wall appeared next to
+        them); the problem must already return the new costs.
+        """
+        for state in states:
+            self.updateState(state)
 
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+jps = jumpPointSearch
+arastar = anytimeRepairingAStarSearch
+idastar = idaStarSearch
+smastar = smaStarSearch
+bds = bidirectionalSearch
+hpa = hierarchicalSearch
@@ -37,9 +37,16 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import BitGrid
 import util
 import time
 import search
+from search import unitCost
+import distanceCalculator
+import hierarchy
+import landmarks
+import layout
+import wavefront
 
 class GoWestAgent(Agent):
     "An agent that goes West until it can't."
@@ -133,6 +140,50 @@ class SearchAgent(Agent):
         else:
             return Directions.STOP
 
+# Maps (width, height, hash of the walls) to the walls and adjacency table
+# of a maze (see util.cachedForWalls)
+ADJACENCY_CACHE = {}
+
+def adjacencyTable(walls):
+    """
+    Returns a dictionary mapping every open cell of the maze to a tuple of
+    (nextCell, action) pairs, in NORTH, SOUTH, EAST, WEST order.  The table
+    is built once per maze and shared by all the search problems on it.
+    """
+    def build():
+        table = {}
+        directions = [(action, Actions.directionToVector(action)) for action in
+                      [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]]
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if walls[x][y]: continue
+                moves = []
+                for action, (dx, dy) in directions:
+                    nextx, nexty = int(x + dx), int(y + dy)
+                    if not walls[nextx][nexty]:
+                        moves.append(((nextx, nexty), action))
+                table[(x, y)] = tuple(moves)
+        return table
+    return util.cachedForWalls(ADJACENCY_CACHE, (walls.width, walls.height, hash(walls)), walls, build)
+
+# Maps the keys of ADJACENCY_CACHE to successor tables with unit step costs
+UNIT_SUCCESSOR_CACHE = {}
+
+def successorTable(walls, costFn=unitCost):
+    """
+    Returns a dictionary mapping every open cell of the maze to a tuple of
+    (successor, action, stepCost) triples, as returned by getSuccessors of a
+    PositionSearchProblem.  Step costs are computed once per edge; tables
+    for unit costs are shared by all problems on the same maze.
+    """
+    adjacency = adjacencyTable(walls)
+    if costFn is unitCost:
+        build = lambda: dict((cell, tuple([(nextCell, action, 1) for nextCell, action in moves]))
+                             for cell, moves in adjacency.iteritems())
+        return util.cachedForWalls(UNIT_SUCCESSOR_CACHE, (walls.width, walls.height, hash(walls)), walls, build)
+    return dict((cell, tuple([(nextCell, action, costFn(nextCell)) for nextCell, action in moves]))
+                for cell, moves in adjacency.iteritems())
+
 class PositionSearchProblem(search.SearchProblem):
     """
     A search problem defines the state space, start state, goal test, successor
@@ -144,7 +195,10 @@ class PositionSearchProblem(search.SearchProblem):
     Note: this search problem is fully specified; you should NOT change it.
     """
 
-    def __init__(self, gameState, costFn = lambda x: 1, goal=(1,1), start=None, warn=True, visualize=True):
+    # Its actions are single steps between open cells (see search.isJumpPointGrid)
+    supportsJumpPoints = True
+
+    def __init__(self, gameState, costFn = unitCost, goal=(1,1), start=None, warn=True, visualize=True):
         """
         Stores the start and goal.
 
@@ -157,6 +211,7 @@ class PositionSearchProblem(search.SearchProblem):
         if start != None: self.startState = start
         self.goal = goal
         self.costFn = costFn
+        self.successors = successorTable(self.walls, costFn)
         self.visualize = visualize
         if warn and (gameState.getNumFood() != 1 or not gameState.hasFood(*goal)):
             print 'Warning: this does not look like a regular search maze'
@@ -192,23 +247,32 @@ class PositionSearchProblem(search.SearchProblem):
          cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
+        return list(self.iterSuccessors(state))
 
+    def iterSuccessors(self, state):
+        "Like getSuccessors, but walks the precomputed successors without copying them"
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
         if state not in self._visited:
             self._visited[state] = True
             self._visitedlist.append(state)
+        return iter(self.successors[state])
 
-        return successors
+    def getGoalState(self):
+        return self.goal
+
+    def getPredecessors(self, state):
+        """
+        Returns the cells from which state can be reached in one move.  Moves
+        on the board are reversible, so these are the successors of state,
+        with the actions reversed and the cost of entering state.
+        """
+        self._expanded += 1 # DO NOT CHANGE
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+        stepCost = self.costFn(state)
+        return [(pred, Actions.reverseDirection(action), stepCost) for pred, action, cost in self.successors[state]]
 
     def getCostOfActions(self, actions):
         """
@@ -226,6 +290,132 @@ class PositionSearchProblem(search.SearchProblem):
             cost += self.costFn((x,y))
         return cost
 
+class CorridorSearchProblem(search.SearchProblem):
+    """
+    Searches the corridor-contracted maze (layout.CorridorGraph) of a
+    problem whose states are positions and which has a single goal, such as
+    a PositionSearchProblem.  The states are the junctions and dead ends of
+    the maze plus the start and the goal; each action is a whole corridor,
+    a tuple of Directions, and costs as much as its steps do in the wrapped
+    problem.  Searches therefore expand no corridor cells.
+
+    expandActions turns a solution back into the primitive Directions the
+    wrapped problem (and Pacman) understands.  Corridors differ in length,
+    so use uniform cost search or A* for shortest paths.  The walls and
+    costFn of the wrapped problem stay on self.problem: this problem's
+    states are cells but its actions are not single steps, so it must not
+    pass for a grid problem.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.goal = problem.getGoalState()
+        if self.goal is None:
+            raise Exception('CorridorSearchProblem needs a problem with a single goal state')
+        self.startState = problem.getStartState()
+        self.graph = layout.getCorridorGraph(problem.walls).withKeyCells([self.startState, self.goal])
+        self._expanded = 0 # DO NOT CHANGE
+
+    def getStartState(self):
+        return self.startState
+
+    def isGoalState(self, state):
+        return self.problem.isGoalState(state)
+
+    def getGoalState(self):
+        return self.goal
+
+    def corridorCost(self, cells):
+        "The cost of entering each of the cells in turn"
+        costFn = self.problem.costFn
+        if costFn is unitCost:
+            return len(cells)
+        return sum([costFn(cell) for cell in cells])
+
+    def getSuccessors(self, state):
+        """
+        Returns (end, actions, cost) for every corridor leaving state, where
+        actions is the tuple of Directions walking it.
+        """
+        self._expanded += 1 # DO NOT CHANGE
+        return [(end, actions, self.corridorCost(cells)) for end, actions, cells in self.graph.edges[state]]
+
+    def getPredecessors(self, state):
+        "Corridors can be walked both ways; returns those leading into state"
+        self._expanded += 1 # DO NOT CHANGE
+        predecessors = []
+        for end, actions, cells in self.graph.edges[state]:
+            back = tuple([Actions.reverseDirection(action) for action in reversed(actions)])
+            predecessors.append((end, back, self.corridorCost(cells[-2::-1] + (state,))))
+        return predecessors
+
+    def expandActions(self, actions):
+        "Flattens a list of corridor actions into a list of Directions"
+        if actions is None: return None
+        return [action for corridor in actions for action in corridor]
+
+    def getCostOfActions(self, actions):
+        """
+        Returns the cost of a list of corridor actions, as the wrapped
+        problem computes it for the equivalent primitive actions.
+        """
+        return self.problem.getCostOfActions(self.expandActions(actions))
+
+class CorridorSearchAgent(SearchAgent):
+    """
+    A SearchAgent that solves the CorridorSearchProblem of its problem and
+    follows the expanded path.  It takes the same arguments as SearchAgent:
+
+    > python pacman.py -l bigMaze -p CorridorSearchAgent -a fn=astar,heuristic=manhattanHeuristic
+    """
+
+    def registerInitialState(self, state):
+        if self.searchFunction == None: raise Exception, "No search function provided for CorridorSearchAgent"
+        starttime = time.time()
+        problem = self.searchType(state) # Makes a new search problem
+        corridors = CorridorSearchProblem(problem)
+        self.actions = corridors.expandActions(self.searchFunction(corridors)) # Find a path
+        totalCost = problem.getCostOfActions(self.actions)
+        print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
+        print('Search nodes expanded: %d' % corridors._expanded)
+
+class HierarchicalSearchProblem(PositionSearchProblem):
+    """
+    The abstract graph of hierarchy.ClusterGraph for a PositionSearchProblem
+    with unit step costs.  States are the entrance cells between clusters
+    plus the start and the goal, the action to a neighbouring node is that
+    node itself, and steps cost the maze distance between the two nodes.
+    Search it with hierarchicalSearch (hpa), which refines the route it
+    finds into Directions with refineRoute:
+
+    > python pacman.py -l bigMaze -p SearchAgent -a fn=hpa,prob=HierarchicalSearchProblem,heuristic=manhattanHeuristic
+
+    getCostOfActions takes those refined Directions.  Routes through the
+    abstract graph may be slightly longer than the shortest paths.
+    """
+
+    def __init__(self, gameState, goal=(1,1), start=None, warn=True, visualize=True, clusterSize=hierarchy.CLUSTER_SIZE):
+        PositionSearchProblem.__init__(self, gameState, unitCost, goal, start, warn, visualize)
+        self.graph = hierarchy.getClusterGraph(self.walls, clusterSize).withEndpoints([self.startState, self.goal])
+
+    def getSuccessors(self, state):
+        "Returns (node, node, distance) for every node connected to state"
+        self._expanded += 1 # DO NOT CHANGE
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+        return [(node, node, cost) for node, cost in self.graph.edges[state].iteritems()]
+
+    def getPredecessors(self, state):
+        "The edges are undirected, so these are the neighbours of state, each moving to state"
+        self._expanded += 1 # DO NOT CHANGE
+        return [(node, state, cost) for node, cost in self.graph.edges[state].iteritems()]
+
+    def refineRoute(self, actions):
+        "Refines a route through the abstract graph into Directions"
+        if actions is None: return None
+        return self.graph.refine(self.startState, actions)
+
 class StayEastSearchAgent(SearchAgent):
     """
     An agent for position search with a cost function that penalizes being in
@@ -262,6 +452,15 @@ def euclideanHeuristic(position, problem, info={}):
     xy2 = problem.goal
     return ( (xy1[0] - xy2[0]) ** 2 + (xy1[1] - xy2[1]) ** 2 ) ** 0.5
 
+def landmarkHeuristic(position, problem, info={}):
+    """
+    The landmark (ALT) heuristic for a PositionSearchProblem: a lower bound
+    on the maze distance to the goal derived from precomputed distances to
+    a few landmark cells (see landmarks.py).  Unlike the Manhattan distance
+    it accounts for walls.  Like it, it assumes every step costs at least 1.
+    """
+    return landmarks.getLandmarkTable(problem.walls).lowerBound(position, problem.goal)
+
 #####################################################
 # This portion is incomplete.  Time to write code!  #
 #####################################################
@@ -288,8 +487,9 @@ class CornersProblem(search.SearchProblem):
         # Please add any code here which you would like to use
         # in initializing the problem
         "*** YOUR CODE HERE ***"
-        self.start = (self.startingPosition, startingGameState.getFood())
-        #((position), [foodGrid])
+        self.start = (self.startingPosition, BitGrid.fromGrid(startingGameState.getFood()))
+        #((position), foodBitGrid)
+        self.adjacency = adjacencyTable(self.walls)
 
     def getStartState(self):
         """
@@ -316,28 +516,16 @@ class CornersProblem(search.SearchProblem):
             state, 'action' is the action required to get there, and 'stepCost'
             is the incremental cost of expanding to that successor
         """
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            # Add a successor state to the successor list if the action is legal
-            # Here's a code snippet for figuring out whether a new position hits a wall:
-            #   x,y = currentPosition
-            #   dx, dy = Actions.directionToVector(action)
-            #   nextx, nexty = int(x + dx), int(y + dy)
-            #   hitsWall = self.walls[nextx][nexty]
-            "*** YOUR CODE HERE ***"
-            x,y = state[0]
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            hitsWall = self.walls[nextx][nexty]
-            if not hitsWall:
-                nextState = (nextx, nexty)
-                #cost = self.costFn(nextState)
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append( ( (nextState, nextFood), action, 1) )
+        "*** YOUR CODE HERE ***"
+        return list(self.iterSuccessors(state))
 
+    def iterSuccessors(self, state):
+        "Yields the successors one at a time, building each food grid only when it is needed"
         self._expanded += 1 # DO NOT CHANGE
-        return successors
+        # The legal moves out of every cell are precomputed in self.adjacency
+        # (see adjacencyTable), so there is no need to check for walls here.
+        for nextState, action in self.adjacency[state[0]]:
+            yield ( (nextState, state[1].without(*nextState)), action, 1)
 
     def getCostOfActions(self, actions):
         """
@@ -425,12 +613,13 @@ class FoodSearchProblem:
 
     A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
-      foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+      foodGrid:       a BitGrid (see game.py) of either True or False, specifying remaining food
     """
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        self.start = (startingGameState.getPacmanPosition(), BitGrid.fromGrid(startingGameState.getFood()))
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
+        self.adjacency = adjacencyTable(self.walls)
         self._expanded = 0 # DO NOT CHANGE
         self.heuristicInfo = {} # A dictionary for the heuristic to store information
 
@@ -442,17 +631,13 @@ class FoodSearchProblem:
 
     def getSuccessors(self, state):
         "Returns successor states, the actions they require, and a cost of 1."
-        successors = []
+        return list(self.iterSuccessors(state))
+
+    def iterSuccessors(self, state):
+        "Yields the successors one at a time, building each food grid only when it is needed"
         self._expanded += 1 # DO NOT CHANGE
-        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
-        return successors
+        for nextState, direction in self.adjacency[state[0]]:
+            yield ( (nextState, state[1].without(*nextState)), direction, 1)
 
     def getCostOfActions(self, actions):
         """Returns the cost of a particular sequence of actions.  If those actions
@@ -474,6 +659,32 @@ class AStarFoodSearchAgent(SearchAgent):
         self.searchFunction = lambda prob: search.aStarSearch(prob, foodHeuristic)
         self.searchType = FoodSearchProblem
 
+class AnytimeFoodSearchAgent(SearchAgent):
+    """
+    A SearchAgent for FoodSearchProblem using anytime repairing A* and your
+    foodHeuristic.  The search starts with an inflated heuristic so a first
+    path is found quickly even on large layouts, then improves it until
+    timeLimit seconds have passed.  self.actions always holds the best path
+    found so far.
+
+    With the spanning tree foodHeuristic a weight of 5 is already greedy
+    enough: 50, 10 and 5 all find the same first paths, after 0.6s on
+    mediumSearch and about 3s on bigSearch, while 3 takes 8s on bigSearch
+    and 2 finds nothing there in 10s.  Larger weights only add rounds.
+    """
+    def __init__(self, timeLimit=search.ARA_TIME_LIMIT, weight=search.ARA_INITIAL_WEIGHT,
+                 weightStep=search.ARA_WEIGHT_STEP):
+        self.timeLimit = float(timeLimit)
+        self.weight = float(weight)
+        self.weightStep = float(weightStep)
+        self.searchFunction = lambda prob: search.anytimeRepairingAStarSearch(
+            prob, foodHeuristic, self.timeLimit, self.foundPath, self.weight, self.weightStep)
+        self.searchType = FoodSearchProblem
+
+    def foundPath(self, actions, cost, bound):
+        "Called by the search with every improved path"
+        self.actions = actions
+
 def foodHeuristic(state, problem):
     """
     Your heuristic for the FoodSearchProblem goes here.
@@ -487,7 +698,7 @@ def foodHeuristic(state, problem):
     other hand, inadmissible or inconsistent heuristics may find optimal
     solutions, so be careful.
 
-    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a Grid
+    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a BitGrid
     (see game.py) of either True or False. You can call foodGrid.asList() to get
     a list of food coordinates instead.
 
@@ -575,41 +786,76 @@ def foodHeuristic(state, problem):
     #return dist_to_closest + remaining_dist
     return mazeDistance(currPos, min_dist_food, problem.startingGameState) + len(food_list)
     """
-    from util import manhattanDistance
-    import sys
-    food_list = foodGrid.asList()
-    currPos = position
-    min_dist = sys.maxint
-    min_dist_food = None
-    dist_to_closest = 0
-    remaining_dist = 0
-    if len(food_list)>0:
-        for c in food_list:
-            x = manhattanDistance(currPos, c)
-            if x < min_dist:
-                min_dist = x
-                min_dist_food = c
-        dist_to_closest = min_dist
-        food_list.remove(min_dist_food)
-    else:
-        return 0
-    return manhattanDistance(currPos, min_dist_food) + len(food_list)
-    
+    food = foodGrid.asList()
+    if not food: return 0
+    info = problem.heuristicInfo
+    if 'mstCache' not in info:
+        info['distancer'] = distanceCalculator.getDistancer(problem.startingGameState.data.layout)
+        info['mstCache'] = util.LRUCache(MST_CACHE_SIZE)
+    distancer, mstCache = info['distancer'], info['mstCache']
+
+    # Every state with the same food left (all the positions Pacman can be
+    # in between two dots) shares one tree
+    treeWeight = mstCache.get(foodGrid)
+    if treeWeight is None:
+        treeWeight = foodTreeWeight(food, distancer)
+        mstCache.put(foodGrid, treeWeight)
+    distances = [d for d in [distancer.getDistance(position, dot) for dot in food] if d is not None]
+    if not distances: return treeWeight
+    return min(distances) + treeWeight
+
+# The number of food grids whose spanning tree weights foodHeuristic keeps
+MST_CACHE_SIZE = 100000
+
+def foodTreeWeight(food, distancer):
+    """
+    Returns the weight of a minimum spanning tree over the food positions,
+    with maze distances as edge weights (Prim's algorithm).  Eating every
+    dot means walking at least a tree spanning them, so the weight never
+    overestimates the rest of the path.  Dots in another part of a
+    disconnected maze are left out.
+    """
+    first, rest = food[0], food[1:]
+    # Distance from each dot not yet in the tree to its nearest dot in it
+    nearest = {}
+    for dot in rest:
+        d = distancer.getDistance(first, dot)
+        if d is not None: nearest[dot] = d
+    total = 0
+    while nearest:
+        dot = min(nearest, key=nearest.get)
+        total += nearest.pop(dot)
+        for other in nearest.keys():
+            d = distancer.getDistance(dot, other)
+            if d is not None and d < nearest[other]: nearest[other] = d
+    return total
 
 class ClosestDotSearchAgent(SearchAgent):
     "Search for all food using a sequence of searches"
     def registerInitialState(self, state):
+        """
+        Builds the whole tour up front.  Instead of a new search (and a
+        replay through game states) per dot, it keeps the distance from
+        every cell to the nearest remaining dot in a
+        wavefront.NearestSourceField, walks down that field to the closest
+        dot and repairs the field around each dot it eats.  Moves are
+        checked against the adjacency table of the maze.
+        """
         self.actions = []
-        currentState = state
-        while(currentState.getFood().count() > 0):
-            nextPathSegment = self.findPathToClosestDot(currentState) # The missing piece
-            self.actions += nextPathSegment
-            for action in nextPathSegment:
-                legal = currentState.getLegalActions()
-                if action not in legal:
-                    t = (str(action), str(currentState))
-                    raise Exception, 'findPathToClosestDot returned an illegal move: %s!\n%s' % t
-                currentState = currentState.generateSuccessor(0, action)
+        adjacency = adjacencyTable(state.getWalls())
+        dots = wavefront.NearestSourceField(state.getWalls(), state.getFood())
+        position = state.getPacmanPosition()
+        while dots.sources:
+            cells = dots.pathToNearest(position)
+            if cells is None:
+                raise Exception, 'No path to the remaining dots from %s' % str(position)
+            for cell in cells[1:]:
+                moves = dict(adjacency[position])
+                if cell not in moves:
+                    raise Exception, 'Illegal move from %s to %s' % (str(position), str(cell))
+                self.actions.append(moves[cell])
+                position = cell
+                dots.removeSource(cell)
         self.actionIndex = 0
         print 'Path found with cost %d.' % len(self.actions)
 
@@ -645,11 +891,37 @@ class ClosestDotSearchAgent(SearchAgent):
                 return n.backtrack()
             n = m
             """
-        return search.astar(problem)
+        # Every step costs 1, so the first dot generated is a closest one
+        return search.breadthFirstSearch(problem, earlyGoalTest=True)
             
 
 
 
+class ReplanningFoodSearchAgent(Agent):
+    """
+    Heads for the closest dot after every move, like ClosestDotSearchAgent,
+    but plans during the game.  A single search.DStarLite is kept for the
+    whole game with every dot as a goal; each move only tells it where
+    Pacman went and which dot disappeared, so replanning repairs the
+    distances around the change instead of searching again.
+
+    > python pacman.py -l bigSearch -p ReplanningFoodSearchAgent -z .5
+    """
+
+    def registerInitialState(self, state):
+        problem = PositionSearchProblem(state, warn=False, visualize=False)
+        self.planner = search.DStarLite(problem, goals=state.getFood().asList(), distance=util.manhattanDistance)
+
+    def getAction(self, state):
+        position = state.getPacmanPosition()
+        self.planner.moveStart(position)
+        if position in self.planner.goals and not state.hasFood(*position):
+            self.planner.removeGoal(position)
+        actions = self.planner.plan()
+        if not actions:
+            return Directions.STOP
+        return actions[0]
+
 class AnyFoodSearchProblem(PositionSearchProblem):
     """
     A search problem for finding a path to any food.
@@ -673,7 +945,8 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         # Store info for the PositionSearchProblem (no need to change this)
         self.walls = gameState.getWalls()
         self.startState = gameState.getPacmanPosition()
-        self.costFn = lambda x: 1
+        self.costFn = unitCost
+        self.successors = successorTable(self.walls)
         self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
 
 
@@ -689,9 +962,9 @@ class AnyFoodSearchProblem(PositionSearchProblem):
 
 def mazeDistance(point1, point2, gameState):
     """
-    Returns the maze distance between any two points, using the search functions
-    you have already built. The gameState can be any game state -- Pacman's
-    position in that state is ignored.
+    Returns the maze distance between any two points, looked up in the
+    distance table of the layout (see distanceCalculator.py). The gameState
+    can be any game state -- Pacman's position in that state is ignored.
 
     Example usage: mazeDistance( (2,4), (5,6), gameState)
 
@@ -702,6 +975,6 @@ def mazeDistance(point1, point2, gameState):
     walls = gameState.getWalls()
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
-    prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    # All-pairs distances are computed once per maze and cached on disk
+    return distanceCalculator.getDistancer(gameState.data.layout).getDistance(point1, point2)
 
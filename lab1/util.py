@@ -15,6 +15,7 @@
 import sys
 import inspect
 import heapq, random
+from collections import deque
 import cStringIO
 
 
@@ -134,26 +135,32 @@ class Stack:
         "Returns true if the stack is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class Queue:
     "A container with a first-in-first-out (FIFO) queuing policy."
     def __init__(self):
-        self.list = []
+        self.list = deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0,item)
+        self.list.append(item)
 
     def pop(self):
         """
           Dequeue the earliest enqueued item still in the queue. This
           operation removes the item from the queue.
         """
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         "Returns true if the queue is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class PriorityQueue:
     """
       Implements a priority queue data structure. Each inserted item
@@ -185,6 +192,155 @@ class PriorityQueue:
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def __len__(self):
+        return len(self.heap)
+
+class IndexedPriorityQueue:
+    """
+      A binary heap priority queue that holds every item at most once and
+      keeps an index from items to their heap positions.  This allows
+      membership tests, priority lookups and decrease-key updates in O(1)
+      and O(log n) time instead of scanning the queue.
+
+      Items must be hashable.  As in PriorityQueue, items with equal
+      priority are popped in the order in which they were pushed (or last
+      had their priority decreased).
+    """
+    def  __init__(self):
+        self.heap = []
+        self.index = {}
+        self.count = 0
+
+    def push(self, item, priority):
+        """
+        Adds the item with the given priority.  If the item is already in
+        the queue this behaves like decreaseKey.
+        """
+        if item in self.index:
+            return self.decreaseKey(item, priority)
+        entry = [priority, self.count, item]
+        self.count += 1
+        self.heap.append(entry)
+        self.index[item] = len(self.heap) - 1
+        self._siftUp(len(self.heap) - 1)
+        return True
+
+    def pop(self):
+        "Removes and returns the item with the lowest priority"
+        return self.popWithPriority()[0]
+
+    def popWithPriority(self):
+        "Removes and returns an (item, priority) pair for the lowest priority item"
+        heap = self.heap
+        last = heap.pop()
+        if heap:
+            top = heap[0]
+            heap[0] = last
+            self.index[last[2]] = 0
+            self._siftDown(0)
+        else:
+            top = last
+        del self.index[top[2]]
+        return top[2], top[0]
+
+    def decreaseKey(self, item, priority):
+        """
+        Lowers the priority of an item already in the queue.  Returns False
+        (and leaves the queue untouched) if the new priority is not lower.
+        """
+        i = self.index[item]
+        entry = self.heap[i]
+        if priority >= entry[0]:
+            return False
+        entry[0] = priority
+        entry[1] = self.count
+        self.count += 1
+        self._siftUp(i)
+        return True
+
+    def update(self, item, priority):
+        """
+        Sets the priority of a queued item, whether it rises or falls, or
+        pushes the item if it is not queued.
+        """
+        i = self.index.get(item)
+        if i is None:
+            return self.push(item, priority)
+        entry = self.heap[i]
+        if priority < entry[0]:
+            return self.decreaseKey(item, priority)
+        entry[0] = priority
+        self._siftDown(i)
+        return True
+
+    def remove(self, item):
+        "Removes a queued item"
+        heap = self.heap
+        i = self.index.pop(item)
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            self.index[last[2]] = i
+            self._siftDown(i)
+            self._siftUp(self.index[last[2]])
+
+    def contains(self, item):
+        "Returns true if the item is currently in the queue"
+        return item in self.index
+
+    __contains__ = contains
+
+    def bestCost(self, item):
+        "Returns the priority of a queued item, or None if it is not queued"
+        i = self.index.get(item)
+        if i is None: return None
+        return self.heap[i][0]
+
+    def topPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        return self.heap[0][0]
+
+    def items(self):
+        "Returns a list of the queued items, in no particular order"
+        return [entry[2] for entry in self.heap]
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _less(self, a, b):
+        return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+    def _siftUp(self, i):
+        heap, index = self.heap, self.index
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._less(entry, heap[parent]): break
+            heap[i] = heap[parent]
+            index[heap[i][2]] = i
+            i = parent
+        heap[i] = entry
+        index[entry[2]] = i
+
+    def _siftDown(self, i):
+        heap, index = self.heap, self.index
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n: break
+            if child + 1 < n and self._less(heap[child + 1], heap[child]):
+                child += 1
+            if not self._less(heap[child], entry): break
+            heap[i] = heap[child]
+            index[heap[i][2]] = i
+            i = child
+        heap[i] = entry
+        index[entry[2]] = i
+
 class PriorityQueueWithFunction(PriorityQueue):
     """
     Implements a priority queue with the same push/pop signature of the
@@ -202,6 +358,56 @@ class PriorityQueueWithFunction(PriorityQueue):
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
 
+class LRUCache:
+    """
+      A mapping that holds at most maxSize entries.  When it is full, storing
+      a new entry evicts the least recently used one.  hits and misses count
+      the lookups made with get.
+    """
+    def __init__(self, maxSize):
+        from collections import OrderedDict
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        "Returns the value stored for key (marking it as recently used), or default"
+        if key not in self.entries:
+            self.misses += 1
+            return default
+        value = self.entries.pop(key)
+        self.entries[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self.entries:
+            del self.entries[key]
+        elif len(self.entries) >= self.maxSize:
+            self.entries.popitem(last=False)
+        self.entries[key] = value
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+def cachedForWalls(cache, key, walls, build):
+    """
+    Returns the value stored in the dictionary cache under key for a maze
+    with the given walls, storing build() there first if there is none.
+    Keys hold a hash of the walls, which different mazes may share, so the
+    walls are kept with the value and compared on every lookup; a maze that
+    collides with a cached one replaces it.
+    """
+    entry = cache.get(key)
+    if entry is None or not (entry[0] is walls or entry[0] == walls):
+        entry = (walls, build())
+        cache[key] = entry
+    return entry[1]
+
 def manhattanDistance( xy1, xy2 ):
     "Returns the man distance between points xy1 and xy2"
     return abs( xy1[0] - xy2[0] ) + abs( xy1[1] - xy2[1] )
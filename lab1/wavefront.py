@@ -0,0 +1,241 @@
+# wavefront.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Maze distance fields computed as wavefronts.
+
+distanceField(walls, sources) returns the maze distance from every open
+cell to the nearest of the sources (a list of positions, or a Grid whose
+true cells are the sources) in one call; field[x][y] is the distance, or
+UNREACHABLE.  With NumPy the whole wavefront advances by one layer per
+step through shifted boolean arrays, so the work per layer happens in C
+loops; without it the same field is computed by a breadth first search.
+
+Example:
+field = distanceField(gameState.getWalls(), gameState.getFood())
+field[x][y]         (the maze distance from (x,y) to the nearest food)
+"""
+
+import heapq
+from collections import deque
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+HAVE_NUMPY = numpy is not None
+
+UNREACHABLE = -1
+
+# The last (walls, boolean array of the open cells) of openArray.  Game
+# states copy their layout on every move, so the walls are matched by
+# content, and only one maze is kept
+_lastOpenArray = [None, None]
+
+# The last (walls, sources, field) of nearestDistance
+_lastField = [None, None, None]
+
+def openArray(walls):
+    """
+    Returns a width x height NumPy boolean array that is True on the open
+    cells of the maze, converting the walls only when they differ from
+    those of the last call.
+    """
+    cached = _lastOpenArray[0]
+    if cached is None or not (cached is walls or cached == walls):
+        isOpen = numpy.array([[not walls[x][y] for y in range(walls.height)] for x in range(walls.width)], dtype=bool)
+        _lastOpenArray[:] = [walls, isOpen]
+    return _lastOpenArray[1]
+
+def sourceCells(sources):
+    "Returns the source cells, given either as positions or as a Grid"
+    if hasattr(sources, 'asList'):
+        return sources.asList()
+    return list(sources)
+
+def distanceField(walls, sources):
+    """
+    Returns the maze distance from every cell to the nearest source, as a
+    field indexed [x][y] (a NumPy array when NumPy is available, otherwise
+    a list of lists).  Walls and cells no source reaches hold UNREACHABLE.
+    """
+    cells = sourceCells(sources)
+    if HAVE_NUMPY:
+        return _numpyField(walls, cells)
+    return _bfsField(walls, cells)
+
+def distancesFrom(walls, position):
+    "Returns the distance field of a single source"
+    return distanceField(walls, [position])
+
+def nearestDistance(walls, sources, position):
+    """
+    Returns the maze distance from position to the nearest source, or None
+    if none can be reached.  The field of the last walls and sources asked
+    for is kept, so asking about several positions with the same grids
+    (e.g. the successors of one game state) computes it only once.  The
+    grids must not be changed in between.
+    """
+    if _lastField[0] is not walls or _lastField[1] is not sources:
+        _lastField[:] = [walls, sources, distanceField(walls, sources)]
+    d = _lastField[2][position[0]][position[1]]
+    if d == UNREACHABLE: return None
+    return int(d)
+
+class NearestSourceField:
+    """
+    The distance field of a set of sources, kept up to date as sources are
+    removed.  Removing a source only revisits the cells whose every
+    shortest way to a source ran through it: they are found by a search
+    outwards from the removed source and given new distances from the
+    cells around them, while the rest of the field stays as it is.
+
+    The repaired field matches one computed from scratch after every
+    removal:
+
+    >>> import layout
+    >>> maze = layout.Layout(['%%%%%%%%%%%%', '%P . %.   .%', '% %% % %%% %', '%.   .  % .%',
+    ...                       '% %%%% % % %', '%.  .    %.%', '%%%%%%%%%%%%'])
+    >>> dots = NearestSourceField(maze.walls, maze.food)
+    >>> mismatches = 0
+    >>> for dot in sorted(maze.food.asList(), reverse=True):
+    ...     dots.removeSource(dot)
+    ...     fresh = distanceField(maze.walls, sorted(dots.sources))
+    ...     if [list(column) for column in fresh] != dots.field: mismatches += 1
+    >>> mismatches, len(dots.sources)
+    (0, 0)
+    """
+
+    def __init__(self, walls, sources):
+        self.walls = walls
+        field = distanceField(walls, sources)
+        if HAVE_NUMPY: field = field.tolist()
+        self.field = field
+        self.sources = set([(x, y) for x, y in sourceCells(sources) if not walls[x][y]])
+        # The open cells next to each open cell, in NORTH, SOUTH, EAST, WEST order
+        self.adjacent = {}
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if walls[x][y]: continue
+                self.adjacent[(x, y)] = tuple([(nx, ny) for nx, ny in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y))
+                                               if 0 <= nx < walls.width and 0 <= ny < walls.height and not walls[nx][ny]])
+
+    def __getitem__(self, x):
+        return self.field[x]
+
+    def neighbours(self, cell):
+        "The open cells next to cell, in NORTH, SOUTH, EAST, WEST order"
+        return self.adjacent[cell]
+
+    def removeSource(self, source):
+        "Stops treating source as a source and repairs the field around it"
+        if source not in self.sources: return
+        self.sources.remove(source)
+        field = self.field
+
+        # Walk outwards level by level; a cell is lost when every neighbour
+        # one step closer to a source was lost before it
+        lost = set([source])
+        order = [source]
+        for x, y in order:
+            d = field[x][y]
+            for n in self.neighbours((x, y)):
+                if n in lost or field[n[0]][n[1]] != d + 1: continue
+                for m in self.neighbours(n):
+                    if m not in lost and field[m[0]][m[1]] == d: break
+                else:
+                    lost.add(n)
+                    order.append(n)
+
+        for x, y in order:
+            field[x][y] = UNREACHABLE
+        heap = []
+        for cell in order:
+            best = UNREACHABLE
+            for m in self.neighbours(cell):
+                d = field[m[0]][m[1]]
+                if m not in lost and d != UNREACHABLE and (best == UNREACHABLE or d + 1 < best):
+                    best = d + 1
+            if best != UNREACHABLE:
+                field[cell[0]][cell[1]] = best
+                heapq.heappush(heap, (best, cell))
+        while heap:
+            d, cell = heapq.heappop(heap)
+            if d > field[cell[0]][cell[1]]: continue
+            for n in self.neighbours(cell):
+                if n not in lost: continue
+                nd = field[n[0]][n[1]]
+                if nd == UNREACHABLE or nd > d + 1:
+                    field[n[0]][n[1]] = d + 1
+                    heapq.heappush(heap, (d + 1, n))
+
+    def pathToNearest(self, position):
+        """
+        Returns the cells of a shortest path from position to its nearest
+        source (position first), found by walking down the field, or None
+        if no source can be reached.
+        """
+        field = self.field
+        d = field[position[0]][position[1]]
+        if d == UNREACHABLE: return None
+        path = [position]
+        cell = position
+        while d > 0:
+            for n in self.neighbours(cell):
+                if field[n[0]][n[1]] == d - 1:
+                    cell = n
+                    break
+            path.append(cell)
+            d -= 1
+        return path
+
+def _numpyField(walls, cells):
+    isOpen = openArray(walls)
+    field = numpy.empty(isOpen.shape, dtype=numpy.int32)
+    field.fill(UNREACHABLE)
+    frontier = numpy.zeros(isOpen.shape, dtype=bool)
+    for x, y in cells:
+        frontier[x, y] = True
+    frontier &= isOpen
+    reached = frontier.copy()
+    distance = 0
+    while frontier.any():
+        field[frontier] = distance
+        grown = numpy.zeros(isOpen.shape, dtype=bool)
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & isOpen & ~reached
+        reached |= frontier
+        distance += 1
+    return field
+
+def _bfsField(walls, cells):
+    width, height = walls.width, walls.height
+    field = [[UNREACHABLE] * height for x in range(width)]
+    fringe = deque()
+    for x, y in cells:
+        if not walls[x][y] and field[x][y] == UNREACHABLE:
+            field[x][y] = 0
+            fringe.append((x, y))
+    while fringe:
+        x, y = fringe.popleft()
+        d = field[x][y] + 1
+        for nx, ny in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if 0 <= nx < width and 0 <= ny < height and not walls[nx][ny] and field[nx][ny] == UNREACHABLE:
+                field[nx][ny] = d
+                fringe.append((nx, ny))
+    return field
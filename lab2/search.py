@@ -90,6 +90,104 @@ def constrainedBreadthFirstSearch(problem, legalStates):
     return
 
 
+def constrainedBidirectionalSearch(problem, legalStates):
+    """
+    Like constrainedBreadthFirstSearch, but searches forward from the start
+    and backwards from the goal at the same time, one whole layer of the
+    smaller frontier at a time, and joins the two halves where they meet.
+    Step costs are assumed to be equal.  The problem must provide
+    getGoalState and getPredecessors (PositionSearchProblem does).
+    """
+    startState, goalState = problem.getStartState(), problem.getGoalState()
+    if problem.isGoalState(startState):
+        return []
+
+    # parents[side] maps each reached state to (neighbour, action) in the
+    # direction from start to goal; side 0 is the forward search
+    parents = [{startState: None}, {goalState: None}]
+    layers = [[startState], [goalState]]
+    expanders = [problem.getSuccessors, problem.getPredecessors]
+    depths = [{startState: 0}, {goalState: 0}]
+
+    while layers[0] and layers[1]:
+        side = 1 if len(layers[1]) < len(layers[0]) else 0
+        parent, depth, other = parents[side], depths[side], depths[1 - side]
+        nextLayer = []
+        meeting = None
+        for state in layers[side]:
+            for neighbour, move, _ in expanders[side](state):
+                if neighbour in parent or neighbour not in legalStates:
+                    continue
+                parent[neighbour] = (state, move)
+                depth[neighbour] = depth[state] + 1
+                nextLayer.append(neighbour)
+                if neighbour in other and (meeting is None or
+                        depth[neighbour] + other[neighbour] < depth[meeting] + other[meeting]):
+                    meeting = neighbour
+        if meeting is not None:
+            forward, state = [], meeting
+            while parents[0][state] is not None:
+                state, move = parents[0][state]
+                forward.insert(0, move)
+            state = meeting
+            while parents[1][state] is not None:
+                state, move = parents[1][state]
+                forward.append(move)
+            return forward
+        layers[side] = nextLayer
+
+    print "Search finished, final state not found!"
+    return
+
+
+def unitCost(state):
+    "The cost function of problems in which every step costs 1"
+    return 1
+
+# Maps (width, height, hash of the walls) to the walls and adjacency table
+# of a maze (see util.cachedForWalls)
+ADJACENCY_CACHE = {}
+
+def adjacencyTable(walls):
+    """
+    Returns a dictionary mapping every open cell of the maze to a tuple of
+    (nextCell, action) pairs, in NORTH, SOUTH, EAST, WEST order.  The table
+    is built once per maze and shared by all the search problems on it.
+    """
+    def build():
+        table = {}
+        directions = [(action, Actions.directionToVector(action)) for action in
+                      [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]]
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if walls[x][y]: continue
+                moves = []
+                for action, (dx, dy) in directions:
+                    nextx, nexty = int(x + dx), int(y + dy)
+                    if not walls[nextx][nexty]:
+                        moves.append(((nextx, nexty), action))
+                table[(x, y)] = tuple(moves)
+        return table
+    return util.cachedForWalls(ADJACENCY_CACHE, (walls.width, walls.height, hash(walls)), walls, build)
+
+# Maps the keys of ADJACENCY_CACHE to successor tables with unit step costs
+UNIT_SUCCESSOR_CACHE = {}
+
+def successorTable(walls, costFn=unitCost):
+    """
+    Returns a dictionary mapping every open cell of the maze to a tuple of
+    (successor, action, stepCost) triples, as returned by getSuccessors of a
+    PositionSearchProblem.  Step costs are computed once per edge; tables
+    for unit costs are shared by all problems on the same maze.
+    """
+    adjacency = adjacencyTable(walls)
+    if costFn is unitCost:
+        build = lambda: dict((cell, tuple([(nextCell, action, 1) for nextCell, action in moves]))
+                             for cell, moves in adjacency.iteritems())
+        return util.cachedForWalls(UNIT_SUCCESSOR_CACHE, (walls.width, walls.height, hash(walls)), walls, build)
+    return dict((cell, tuple([(nextCell, action, costFn(nextCell)) for nextCell, action in moves]))
+                for cell, moves in adjacency.iteritems())
+
 
 class PositionSearchProblem():
     """
@@ -101,7 +199,7 @@ class PositionSearchProblem():
 
     """
 
-    def __init__(self, gameState, costFn = lambda x: 1, goal=(1,1), start=None, warn=True, visualize=True):
+    def __init__(self, gameState, costFn = unitCost, goal=(1,1), start=None, warn=True, visualize=True):
         """
         Stores the start and goal.
 
@@ -114,6 +212,7 @@ class PositionSearchProblem():
         if start != None: self.startState = start
         self.goal = goal
         self.costFn = costFn
+        self.successors = successorTable(self.walls, costFn)
         self.visualize = visualize
         if warn and (gameState.getNumFood() != 1 or not gameState.hasFood(*goal)):
             print 'Warning: this does not look like a regular search maze'
@@ -148,15 +247,8 @@ class PositionSearchProblem():
          cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
+        # The successors of every cell are precomputed in self.successors
+        successors = list(self.successors[state])
 
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
@@ -166,6 +258,18 @@ class PositionSearchProblem():
 
         return successors
 
+    def getGoalState(self):
+        return self.goal
+
+    def getPredecessors(self, state):
+        """
+        Returns the cells from which state can be reached in one move, the
+        (reversed) actions that do so and the cost of entering state.
+        """
+        self._expanded += 1 # DO NOT CHANGE
+        stepCost = self.costFn(state)
+        return [(pred, Actions.reverseDirection(action), stepCost) for pred, action, cost in self.successors[state]]
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions. If those actions
@@ -185,7 +289,7 @@ class PositionSearchProblem():
 def pathBetween(point1, point2, legalStates, gameState):
     """
     Returns a possible shortest path through visited states 
-    between any two points, using constrained BFS 
+    between any two points, using a constrained bidirectional BFS
     The gameState can be any game state -- Pacman's
     position in that state is ignored.
 
@@ -198,4 +302,4 @@ def pathBetween(point1, point2, legalStates, gameState):
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
     prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return constrainedBreadthFirstSearch(prob, legalStates)
+    return constrainedBidirectionalSearch(prob, legalStates)
@@ -15,6 +15,7 @@
 import sys
 import inspect
 import heapq, random
+from collections import deque
 import cStringIO
 
 class FixedRandom:
@@ -136,18 +137,18 @@ class Stack:
 class Queue:
     "A container with a first-in-first-out (FIFO) queuing policy."
     def __init__(self):
-        self.list = []
+        self.list = deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0,item)
+        self.list.append(item)
 
     def pop(self):
         """
           Dequeue the earliest enqueued item still in the queue. This
           operation removes the item from the queue.
         """
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         "Returns true if the queue is empty"
@@ -201,6 +202,20 @@ class PriorityQueueWithFunction(PriorityQueue):
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
 
+def cachedForWalls(cache, key, walls, build):
+    """
+    Returns the value stored in the dictionary cache under key for a maze
+    with the given walls, storing build() there first if there is none.
+    Keys hold a hash of the walls, which different mazes may share, so the
+    walls are kept with the value and compared on every lookup; a maze that
+    collides with a cached one replaces it.
+    """
+    entry = cache.get(key)
+    if entry is None or not (entry[0] is walls or entry[0] == walls):
+        entry = (walls, build())
+        cache[key] = entry
+    return entry[1]
+
 def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"
     return abs( xy1[0] - xy2[0] ) + abs( xy1[1] - xy2[1] )
@@ -15,7 +15,10 @@
 "Feature extractors for Pacman game states"
 
 from game import Directions, Actions
+from collections import deque
+import distanceCalculator
 import util
+import wavefront
 
 class FeatureExtractor:
     def getFeatures(self, state, action):
@@ -41,15 +44,26 @@ class CoordinateExtractor(FeatureExtractor):
         feats['action=%s' % action] = 1.0
         return feats
 
-def closestFood(pos, food, walls):
+def closestFood(pos, food, walls, distancer=None):
     """
     closestFood -- this is similar to the function that we have
     worked on in the search project; here its all in one place
+
+    If a Distancer (distanceCalculator.py) for the maze is given, the
+    distances are looked up in its table instead of searched for.  To ask
+    about many positions with the same food, wavefront.nearestDistance
+    computes the distances from all the food at once.
     """
-    fringe = [(pos[0], pos[1], 0)]
+    if distancer is not None:
+        dists = [distancer.getDistance(pos, f) for f in food.asList()]
+        dists = [d for d in dists if d is not None]
+        if not dists:
+            return None
+        return min(dists)
+    fringe = deque([(pos[0], pos[1], 0)])
     expanded = set()
     while fringe:
-        pos_x, pos_y, dist = fringe.pop(0)
+        pos_x, pos_y, dist = fringe.popleft()
         if (pos_x, pos_y) in expanded:
             continue
         expanded.add((pos_x, pos_y))
@@ -94,7 +108,12 @@ class SimpleExtractor(FeatureExtractor):
         if not features["#-of-ghosts-1-step-away"] and food[next_x][next_y]:
             features["eats-food"] = 1.0
 
-        dist = closestFood((next_x, next_y), food, walls)
+        if wavefront.HAVE_NUMPY:
+            # One wavefront from all the food serves every action of the state
+            dist = wavefront.nearestDistance(walls, food, (next_x, next_y))
+        else:
+            distancer = distanceCalculator.getDistancer(state.data.layout)
+            dist = closestFood((next_x, next_y), food, walls, distancer)
         if dist is not None:
             # make the distance a number less than one otherwise the update
             # will diverge wildly
@@ -0,0 +1,129 @@
+# wavefront.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Maze distance fields computed as wavefronts.
+
+distanceField(walls, sources) returns the maze distance from every open
+cell to the nearest of the sources (a list of positions, or a Grid whose
+true cells are the sources) in one call; field[x][y] is the distance, or
+UNREACHABLE.  With NumPy the whole wavefront advances by one layer per
+step through shifted boolean arrays, so the work per layer happens in C
+loops; without it the same field is computed by a breadth first search.
+
+Example:
+field = distanceField(gameState.getWalls(), gameState.getFood())
+field[x][y]         (the maze distance from (x,y) to the nearest food)
+"""
+
+from collections import deque
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+HAVE_NUMPY = numpy is not None
+
+UNREACHABLE = -1
+
+# The last (walls, boolean array of the open cells) of openArray.  Game
+# states copy their layout on every move, so the walls are matched by
+# content, and only one maze is kept
+_lastOpenArray = [None, None]
+
+# The last (walls, sources, field) of nearestDistance
+_lastField = [None, None, None]
+
+def openArray(walls):
+    """
+    Returns a width x height NumPy boolean array that is True on the open
+    cells of the maze, converting the walls only when they differ from
+    those of the last call.
+    """
+    cached = _lastOpenArray[0]
+    if cached is None or not (cached is walls or cached == walls):
+        isOpen = numpy.array([[not walls[x][y] for y in range(walls.height)] for x in range(walls.width)], dtype=bool)
+        _lastOpenArray[:] = [walls, isOpen]
+    return _lastOpenArray[1]
+
+def sourceCells(sources):
+    "Returns the source cells, given either as positions or as a Grid"
+    if hasattr(sources, 'asList'):
+        return sources.asList()
+    return list(sources)
+
+def distanceField(walls, sources):
+    """
+    Returns the maze distance from every cell to the nearest source, as a
+    field indexed [x][y] (a NumPy array when NumPy is available, otherwise
+    a list of lists).  Walls and cells no source reaches hold UNREACHABLE.
+    """
+    cells = sourceCells(sources)
+    if HAVE_NUMPY:
+        return _numpyField(walls, cells)
+    return _bfsField(walls, cells)
+
+def nearestDistance(walls, sources, position):
+    """
+    Returns the maze distance from position to the nearest source, or None
+    if none can be reached.  The field of the last walls and sources asked
+    for is kept, so asking about several positions with the same grids
+    (e.g. the successors of one game state) computes it only once.  The
+    grids must not be changed in between.
+    """
+    if _lastField[0] is not walls or _lastField[1] is not sources:
+        _lastField[:] = [walls, sources, distanceField(walls, sources)]
+    d = _lastField[2][position[0]][position[1]]
+    if d == UNREACHABLE: return None
+    return int(d)
+
+def _numpyField(walls, cells):
+    isOpen = openArray(walls)
+    field = numpy.empty(isOpen.shape, dtype=numpy.int32)
+    field.fill(UNREACHABLE)
+    frontier = numpy.zeros(isOpen.shape, dtype=bool)
+    for x, y in cells:
+        frontier[x, y] = True
+    frontier &= isOpen
+    reached = frontier.copy()
+    distance = 0
+    while frontier.any():
+        field[frontier] = distance
+        grown = numpy.zeros(isOpen.shape, dtype=bool)
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & isOpen & ~reached
+        reached |= frontier
+        distance += 1
+    return field
+
+def _bfsField(walls, cells):
+    width, height = walls.width, walls.height
+    field = [[UNREACHABLE] * height for x in range(width)]
+    fringe = deque()
+    for x, y in cells:
+        if not walls[x][y] and field[x][y] == UNREACHABLE:
+            field[x][y] = 0
+            fringe.append((x, y))
+    while fringe:
+        x, y = fringe.popleft()
+        d = field[x][y] + 1
+        for nx, ny in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if 0 <= nx < width and 0 <= ny < height and not walls[nx][ny] and field[nx][ny] == UNREACHABLE:
+                field[nx][ny] = d
+                fringe.append((nx, ny))
+    return field